@@ -0,0 +1,67 @@
+"""
+Shared helpers for the benchmark scripts: result files, comparison and RSS.
+"""
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+
+def peak_rss_kb():
+    """Returns the peak resident set size of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def metadata():
+    """Describes the machine and code a set of results was produced on."""
+    import toPrint
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "version": toPrint.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(path, suite, results):
+    """Writes results to path as JSON, keyed by case name."""
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"suite": suite, "meta": metadata(), "results": results}, fh,
+                  indent=2, sort_keys=True)
+
+
+def compare(old_path, results, metric, threshold, higher_is_better=True):
+    """Prints cases where metric regressed by more than threshold.
+
+    Returns the number of regressions, so callers can use it as exit code.
+    """
+    with open(old_path, encoding="utf-8") as fh:
+        old = json.load(fh)["results"]
+    regressions = 0
+    for name, result in sorted(results.items()):
+        if name not in old or not old[name].get(metric):
+            continue
+        change = result[metric] / old[name][metric] - 1
+        if not higher_is_better:
+            change = -change
+        flag = ""
+        if change < -threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print("%-48s %+7.1f%%%s" % (name, 100 * change, flag))
+    return regressions
@@ -0,0 +1,88 @@
+"""
+Speed and quality benchmark for the toPrint.dither methods.
+
+Dithers synthetic label-sized test images with every method, including
+Pillow's built-in convert("1"), and reports milliseconds per image and an
+error score: the RMS difference between the blurred 1-bit result and the
+blurred original, i.e. how far the tones a viewer perceives drift (lower
+is better).
+
+    python benchmarks/bench_dither.py --output dither.json
+"""
+import argparse
+import sys
+import time
+
+from _common import compare, save
+
+# Label sizes in dots: 4x6" at 203 and 300 dpi, and a 2x1" small label.
+SIZES = {"4x6@203": (812, 1218), "4x6@300": (1200, 1800), "2x1@203": (406, 203)}
+
+
+def make_images(width, height):
+    """Returns synthetic test images: a gradient and a photo-like pattern."""
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    y, x = np.mgrid[0:height, 0:width]
+    waves = 127.5 + 127.5 * np.sin(x / 37.0) * np.cos(y / 23.0)
+    photo = Image.fromarray(waves.astype(np.uint8))
+    draw = ImageDraw.Draw(photo)
+    draw.rectangle([width // 8, height // 8, width // 2, height // 4], fill=0)
+    draw.text((width // 8, height // 2), "toPrint 0123456789", fill=255)
+    return {"gradient": gradient, "photo": photo}
+
+
+def error_score(original, dithered, radius=2):
+    """RMS difference between blurred original and blurred 1-bit image."""
+    import numpy as np
+    from PIL import ImageFilter
+
+    blur = ImageFilter.GaussianBlur(radius)
+    a = np.asarray(original.convert("L").filter(blur), dtype=np.float32)
+    b = np.asarray(dithered.convert("L").filter(blur), dtype=np.float32)
+    return float(np.sqrt(np.mean((a - b) ** 2)))
+
+
+def main(argv=None):
+    from toPrint import dither
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=SIZES)
+    parser.add_argument("--methods", nargs="+", default=list(dither.METHODS),
+                        choices=dither.METHODS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare ms/image against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        for image_name, image in make_images(*SIZES[size]).items():
+            for method in args.methods:
+                best = None
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    output = dither.dither(image, method)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                name = "%s/%s/%s" % (size, image_name, method)
+                results[name] = result = {
+                    "ms": 1000 * best, "error": error_score(image, output),
+                    "params": {"size": size, "image": image_name, "method": method},
+                }
+                print("%-36s %9.1f ms %8.2f error" % (name, result["ms"], result["error"]))
+    if args.output:
+        save(args.output, "dither", results)
+    if args.compare:
+        regressions = compare(args.compare, results, "ms", args.threshold,
+                              higher_is_better=False)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Cold-start benchmark for importing toPrint and each of its components.
+
+Every measurement runs "python -X importtime" in a fresh interpreter and
+keeps the best of --repeat runs. The script also checks that importing
+the package pulls in none of the heavy backends (weasyprint, reportlab,
+Pillow, NumPy, pypdf, pypdfium2) or the asyncio and multiprocessing
+machinery, and exits with status 1 when a check fails or --max-ms is
+exceeded, so it can gate releases:
+
+    python benchmarks/bench_import.py --max-ms 50 --output import.json
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from _common import ROOT, compare, save
+
+TARGETS = ("toPrint", "toPrint.cache", "toPrint.template", "toPrint.zpl",
+           "toPrint.dither", "toPrint.raster", "toPrint.renderer", "toPrint.merge",
+           "toPrint.printer", "toPrint.spooler", "toPrint.vfs", "toPrint.pipeline",
+           "toPrint.aio", "toPrint.cli", "toPrint.daemon")
+# Modules "import toPrint" must not load.
+HEAVY = ("weasyprint", "reportlab", "PIL", "numpy", "pypdf", "pypdfium2",
+         "asyncio", "multiprocessing")
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_time(module):
+    """Returns (cumulative microseconds, loaded module names) for one import."""
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    code = "import sys, %s; print(' '.join(sys.modules))" % module
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             env=env, capture_output=True, text=True, check=True)
+    total = 0
+    for line in process.stderr.splitlines():
+        match = _LINE.match(line)
+        # Top-level toPrint entries only: nested imports are included in
+        # them, and the rest is interpreter startup.
+        if match and len(match.group(3)) == 1 and \
+                match.group(4).split(".")[0] == "toPrint":
+            total += int(match.group(2))
+    return total, set(process.stdout.split())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float,
+                        help="fail when importing toPrint takes longer")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare import times against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    results = {}
+    for module in args.modules:
+        best, loaded = min((import_time(module) for _ in range(args.repeat)),
+                           key=lambda result: result[0])
+        results[module] = {"ms": best / 1000.0}
+        print("%-20s %8.1f ms" % (module, best / 1000.0))
+        if module == "toPrint":
+            heavy = sorted(name for name in HEAVY if name in loaded)
+            if heavy:
+                failures += 1
+                print("  import toPrint loads %s" % ", ".join(heavy))
+            if args.max_ms is not None and best / 1000.0 > args.max_ms:
+                failures += 1
+                print("  over the %.1f ms budget" % args.max_ms)
+    if args.output:
+        save(args.output, "import", results)
+    if args.compare:
+        failures += compare(args.compare, results, "ms", args.threshold,
+                            higher_is_better=False)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Throughput and memory benchmark for toPrint.toPrint.
+
+Runs every case of a grid of synthetic corpora (text length, duplicate
+ratio), max_len values, reference tokenizers and toPrint options in a fresh
+interpreter, and reports docs/sec, tokens/sec and peak RSS. Corpora are
+generated from a fixed seed, so runs are comparable across releases:
+
+    python benchmarks/bench_toPrint.py --output before.json
+    python benchmarks/bench_toPrint.py --compare before.json
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import subprocess
+import sys
+import time
+
+from _common import compare, peak_rss_kb, save
+
+# Words per text for each corpus length.
+LENGTHS = {"short": (3, 20), "medium": (100, 500), "long": (5000, 20000)}
+DUPLICATES = (0.0, 0.5, 0.9)
+MAX_LENS = (64, 512)
+TOKENIZERS = ("whitespace", "regex", "batch")
+MODES = {
+    "plain": {},
+    "batch": {"batch_size": 256},
+    "early_stop": {"early_stop": True},
+    # A cold cache starts empty on every repeat; a warm one is filled first.
+    "cache": {"cache": "cold"},
+    "cache_warm": {"cache": "warm"},
+    "workers": {"workers": 4},
+}
+QUICK = {"docs": 2000, "lengths": ("short", "long"), "duplicates": (0.0, 0.9),
+         "max_lens": (512,), "tokenizers": ("whitespace",)}
+
+
+class WhitespaceTokenizer:
+    """Splits on whitespace; the cheapest possible tokenizer."""
+
+    def tokenize(self, text):
+        return text.split()
+
+
+class RegexTokenizer:
+    """Word and punctuation tokens, similar to simple pre-tokenizers."""
+
+    pattern = re.compile(r"\w+|[^\w\s]")
+
+    def tokenize(self, text):
+        return self.pattern.findall(text)
+
+
+class BatchTokenizer(WhitespaceTokenizer):
+    """Whitespace tokenizer that also exposes a batch API."""
+
+    def batch_tokenize(self, texts):
+        return [text.split() for text in texts]
+
+
+TOKENIZER_CLASSES = {"whitespace": WhitespaceTokenizer, "regex": RegexTokenizer,
+                     "batch": BatchTokenizer}
+
+
+def make_corpus(docs, length, duplicates, seed=0):
+    """Builds a reproducible list of texts with Zipf-like word frequencies."""
+    rng = random.Random(seed)
+    vocab = ["w%d%s" % (i, rng.choice(("", ",", ".", "!"))) for i in range(5000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    low, high = LENGTHS[length]
+    texts = []
+    for _ in range(docs):
+        if texts and rng.random() < duplicates:
+            texts.append(rng.choice(texts))
+        else:
+            words = rng.choices(vocab, weights, k=rng.randint(low, high))
+            texts.append(" ".join(words))
+    return texts
+
+
+def run_case(case):
+    """Runs one case in this process and returns its measurements."""
+    import toPrint
+
+    texts = make_corpus(case["docs"], case["length"], case["duplicates"])
+    tokenizer = TOKENIZER_CLASSES[case["tokenizer"]]()
+    options = dict(MODES[case["mode"]])
+    cache = options.pop("cache", None)
+    if cache == "warm":
+        options["cache"] = toPrint.TokenCache()
+        toPrint.toPrint(texts, tokenizer, case["max_len"], **options)
+    rss_before = peak_rss_kb()
+    best = None
+    for _ in range(case["repeat"]):
+        if cache == "cold":
+            options["cache"] = toPrint.TokenCache()
+        start = time.perf_counter()
+        docs = toPrint.toPrint(texts, tokenizer, case["max_len"], **options)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tokens = sum(len(doc) for doc in docs)
+    return {
+        "params": case,
+        "seconds": best,
+        "docs_per_sec": len(texts) / best,
+        "tokens_per_sec": tokens / best,
+        "peak_rss_kb": peak_rss_kb(),
+        "corpus_rss_kb": rss_before,
+    }
+
+
+def cases(args):
+    """Yields the case grid selected on the command line."""
+    grid = itertools.product(args.lengths, args.duplicates, args.max_lens,
+                             args.tokenizers, args.modes)
+    for length, duplicates, max_len, tokenizer, mode in grid:
+        if mode == "batch" and tokenizer != "batch":
+            continue
+        name = "%s/dup%g/max%d/%s/%s" % (length, duplicates, max_len, tokenizer, mode)
+        docs = args.docs if length != "long" else max(1, args.docs // 100)
+        yield name, {"length": length, "duplicates": duplicates, "max_len": max_len,
+                     "tokenizer": tokenizer, "mode": mode, "docs": docs,
+                     "repeat": args.repeat}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lengths", nargs="+", default=list(LENGTHS), choices=LENGTHS)
+    parser.add_argument("--duplicates", nargs="+", type=float, default=DUPLICATES)
+    parser.add_argument("--max-lens", nargs="+", type=int, default=MAX_LENS)
+    parser.add_argument("--tokenizers", nargs="+", default=TOKENIZERS,
+                        choices=TOKENIZERS)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--quick", action="store_true", help="small grid for smoke runs")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare docs/sec against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+    if args.quick:
+        for key, value in QUICK.items():
+            setattr(args, key, value)
+
+    results = {}
+    for name, case in cases(args):
+        # A fresh interpreter per case keeps peak RSS attributable to it.
+        output = subprocess.run([sys.executable, __file__, "--run-case", json.dumps(case)],
+                                check=True, capture_output=True, text=True).stdout
+        results[name] = result = json.loads(output)
+        print("%-48s %12.0f docs/s %14.0f tokens/s %9d KiB"
+              % (name, result["docs_per_sec"], result["tokens_per_sec"],
+                 result["peak_rss_kb"]))
+    if args.output:
+        save(args.output, "toPrint", results)
+    if args.compare:
+        return 1 if compare(args.compare, results, "docs_per_sec", args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
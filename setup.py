@@ -101,6 +101,13 @@ setup(
         'Pillow>=8.0.0',
         'reportlab>=3.6.0',
     ],
+    extras_require={
+        'zpl': ['numpy>=1.17'],
+        'raster': ['numpy>=1.17', 'pypdfium2>=4.0'],
+        'merge': ['pypdf>=5.0'],
+        # The to-print command converts to ZPL by default.
+        'cli': ['numpy>=1.17', 'pypdfium2>=4.0'],
+    },
     project_urls={
         'Bug Reports': 'https://github.com/text2doc/toPrint/issues',
         'Source': 'https://github.com/text2doc/toPrint',
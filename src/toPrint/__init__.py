@@ -12,9 +12,51 @@ toPrint implements a virtual file system in memory. This module provides an inte
 
 # Import only basic package information here
 # Avoid importing components directly to prevent circular imports
-from toPrint.toPrint import toPrint
+from toPrint.toPrint import toPrint, iter_toPrint, iter_windows, Window
 
 __version__ = "0.1.12"
 __version_tuple__ = (0, 1, 17)
 
-__all__ = ["toPrint"]
\ No newline at end of file
+# Everything else is imported from its module on first access, so that
+# "import toPrint" stays cheap for callers needing a single component.
+_LAZY = {
+    "TokenArray": "toPrint.compact",
+    "TokenCache": "toPrint.cache",
+    "RenderCache": "toPrint.cache",
+    "TokenStore": "toPrint.store",
+    "write_store": "toPrint.store",
+    "aiter_toPrint": "toPrint.aio",
+    "RendererPool": "toPrint.renderer",
+    "Template": "toPrint.template",
+    "compile_template": "toPrint.template",
+    "image_to_zpl": "toPrint.zpl",
+    "graphic_field": "toPrint.zpl",
+    "StoredFormat": "toPrint.zpl",
+    "zpl_batch": "toPrint.zpl",
+    "ConnectionPool": "toPrint.printer",
+    "get_pool": "toPrint.printer",
+    "Spooler": "toPrint.spooler",
+    "iter_raster": "toPrint.raster",
+    "print_pdf": "toPrint.raster",
+    "merge_pdfs": "toPrint.merge",
+    "MemoryFS": "toPrint.vfs",
+    "Pipeline": "toPrint.pipeline",
+    "PrintDaemon": "toPrint.daemon",
+}
+
+__all__ = ["toPrint", "iter_toPrint", "iter_windows", "Window"] + list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    from importlib import import_module
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,55 @@
+import asyncio
+import inspect
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from toPrint.toPrint import _tokenize_text, _truncate
+
+
+async def _aiterate(texts):
+    """Iterates over an async iterable or a plain iterable of texts."""
+    if hasattr(texts, "__aiter__"):
+        async for text in texts:
+            yield text
+    else:
+        for text in texts:
+            yield text
+
+
+async def _tokenize(tokenizer, text, max_len, executor):
+    """Tokenizes one text without blocking the event loop."""
+    if inspect.iscoroutinefunction(tokenizer.tokenize):
+        return _truncate(await tokenizer.tokenize(text), max_len)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _tokenize_text, tokenizer, text,
+                                      max_len)
+
+
+async def aiter_toPrint(texts, tokenizer, max_len=512, window=16, executor=None):
+    """Asynchronously yields tokenized documents in input order.
+
+    texts may be an async iterable (e.g. lines read from a socket) or a
+    plain iterable. A coroutine tokenizer.tokenize is awaited directly;
+    a blocking one runs in executor, by default a single thread, since many
+    tokenizers may not be called from several threads at once. Pass an
+    executor with more workers for thread-safe tokenizers that release the
+    GIL. At most window texts are in flight, and no more texts are pulled
+    from the source until the oldest one has been consumed.
+    """
+    owned = None
+    if executor is None and not inspect.iscoroutinefunction(tokenizer.tokenize):
+        executor = owned = ThreadPoolExecutor(1, thread_name_prefix="toPrint-aio")
+    pending = deque()
+    try:
+        async for text in _aiterate(texts):
+            pending.append(asyncio.ensure_future(
+                _tokenize(tokenizer, text, max_len, executor)))
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        if owned is not None:
+            owned.shutdown(wait=False)
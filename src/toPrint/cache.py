@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+
+# Distributions whose versions can change rendered output.
+BACKENDS = ("toPrint", "weasyprint", "reportlab", "pypdfium2", "Pillow", "numpy",
+            "pypdf")
+
+
+@lru_cache(maxsize=1)
+def backend_versions():
+    """Returns "name=version" pairs of the installed BACKENDS, read once.
+
+    Versions come from the installed package metadata, so nothing heavy is
+    imported; missing distributions are listed without a version.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    from toPrint import __version__
+
+    found = ["toPrint.__version__=" + __version__]
+    for name in BACKENDS:
+        try:
+            found.append("%s=%s" % (name, version(name)))
+        except PackageNotFoundError:
+            found.append(name + "=")
+    return ";".join(found)
+
+
+class TokenCache:
+    """Bounded LRU cache of tokenized texts, shareable across toPrint calls.
+
+    Entries are keyed by a hash of the text together with the tokenizer's
+    identity and max_len, so one cache can serve several tokenizers. hits
+    and misses count lookups; misses are the texts that reached a tokenizer.
+    """
+
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Tokenizers are kept alive so their id() cannot be reused by another.
+        self._tokenizers = {}
+        self._lock = Lock()
+
+    def key(self, text, tokenizer, max_len):
+        """Returns the cache key for one text."""
+        self._tokenizers.setdefault(id(tokenizer), tokenizer)
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return (id(tokenizer), max_len, digest)
+
+    def get(self, key):
+        """Returns a copy of the cached tokens for key, or None on a miss."""
+        with self._lock:
+            tokens = self._entries.get(key)
+            if tokens is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return list(tokens)
+
+    def put(self, key, tokens):
+        """Stores tokens under key, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = tuple(tokens)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._tokenizers.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        """Returns the counters and current size as a dictionary."""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RenderCache:
+    """Content-addressed on-disk cache of rendered PDF, ZPL or PNG bytes.
+
+    Entries live in directory under the hex digest of their key and are
+    written atomically through a temporary file and os.replace(), so
+    concurrent processes never read partial output. Once the entries exceed
+    max_bytes the least recently used ones are deleted; hits refresh the
+    file's modification time so that order survives restarts.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.startswith("."):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                found.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self._size += size
+
+    @staticmethod
+    def key(content, template=None, options=None, version=None):
+        """Returns the key for rendering content with template and options.
+
+        content and template are str or bytes; options is any JSON-friendly
+        mapping. The versions of toPrint and of its rendering backends are
+        part of the key, so upgrading any of them never serves output
+        rendered by older code. version, if given, is added to them, e.g.
+        for a renderer not in BACKENDS or a hand-maintained template set.
+        """
+        digest = hashlib.sha256(backend_versions().encode("utf-8"))
+        if version is not None:
+            digest.update(b"|" + str(version).encode("utf-8"))
+        parts = (content, template, json.dumps(options, sort_keys=True, default=str))
+        for part in parts:
+            if part is None:
+                part = b""
+            elif isinstance(part, str):
+                part = part.encode("utf-8")
+            digest.update(b"%d:" % len(part))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Returns the cached bytes for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                self._size -= self._entries.pop(key, 0)
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        """Stores data under key and evicts entries beyond max_bytes."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+        with self._lock:
+            self._size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            evicted = []
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old, size = self._entries.popitem(last=False)
+                self._size -= size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(self._path(old))
+            except FileNotFoundError:
+                pass
+
+    def get_or_render(self, key, render):
+        """Returns the cached bytes for key, calling render() on a miss."""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def info(self):
+        """Returns the counters and current size as a dictionary."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                "bytes": self._size, "max_bytes": self.max_bytes}
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,259 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from toPrint.convert import EXTENSIONS, FORMATS, run_job
+
+
+def _add_conversion_options(parser):
+    parser.add_argument("--to", default="zpl", choices=sorted(EXTENSIONS),
+                        help="output format (default: zpl)")
+    parser.add_argument("--printer", help="send the output to HOST[:PORT]")
+    parser.add_argument("--dpi", type=int, help="raster resolution (default: 203)")
+    parser.add_argument("--width", type=int, help="raster width in dots")
+    parser.add_argument("--dither", choices=("threshold", "bayer", "floyd-steinberg",
+                                             "pillow"))
+    parser.add_argument("--compression", choices=("z64", "ascii", "none"))
+
+
+def _options(args):
+    """Returns the convert() options given on the command line."""
+    options = {name: getattr(args, name) for name in ("dpi", "width", "dither",
+                                                      "compression")}
+    options = {name: value for name, value in options.items() if value is not None}
+    if options.get("compression") == "none":
+        options["compression"] = None
+    return options
+
+
+def _output_path(source, target, out_dir, base=None):
+    """Returns where source converted to target goes.
+
+    Under out_dir, files found below a base directory keep their path
+    relative to it; without out_dir, outputs go next to their inputs.
+    """
+    name = os.path.splitext(os.path.basename(source))[0] + EXTENSIONS[target]
+    if not out_dir:
+        return os.path.join(os.path.dirname(source), name)
+    if base is not None:
+        relative = os.path.relpath(os.path.dirname(source), base or os.curdir)
+        out_dir = os.path.normpath(os.path.join(out_dir, relative))
+    return os.path.join(out_dir, name)
+
+
+def _glob_base(pattern):
+    """Returns the leading directories of a glob pattern without wildcards."""
+    while glob.has_magic(pattern):
+        pattern = os.path.dirname(pattern)
+    return pattern
+
+
+def _expand(source):
+    """Yields (path, base) for the input files named by a directory, glob or path.
+
+    base is the directory the files were searched in, or None for a path
+    named directly.
+    """
+    if os.path.isdir(source):
+        for root, _, names in sorted(os.walk(source)):
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() in FORMATS:
+                    yield os.path.join(root, name), source
+    elif glob.has_magic(source):
+        base = _glob_base(source)
+        for path in sorted(glob.glob(source, recursive=True)):
+            if os.path.isfile(path):
+                yield path, base
+    else:
+        yield source, None
+
+
+def _read_manifest(path):
+    """Returns the job dicts of a JSONL manifest, checking every line."""
+    entries = []
+    with open(path, encoding="utf-8") as fh:
+        for number, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as exc:
+                raise ValueError("%s:%d: %s" % (path, number, exc)) from None
+            if not isinstance(entry, dict) or not isinstance(entry.get("input"), str):
+                raise ValueError("%s:%d: a job must be an object with an \"input\" path"
+                                 % (path, number))
+            if entry.get("to", "zpl") not in EXTENSIONS:
+                raise ValueError("%s:%d: unknown output format %r"
+                                 % (path, number, entry["to"]))
+            entries.append(entry)
+    return entries
+
+
+def collect_jobs(sources, target="zpl", out_dir=None, printer=None, options=None):
+    """Builds job dicts for run_job from directories, globs and manifests.
+
+    A source ending in .jsonl is a manifest with one JSON job per line; its
+    jobs inherit target, printer and options unless they set their own.
+    Output files go to out_dir, keeping their path below a searched
+    directory, or next to the inputs unless the jobs are only sent to a
+    printer. Files found in the target format, like the outputs of an
+    earlier run, are skipped, as is any job that would overwrite its own
+    input. Raises ValueError naming the first invalid manifest line, or two
+    jobs writing the same output file.
+    """
+    defaults = dict(options or {}, to=target)
+    if printer:
+        defaults["printer"] = printer
+    jobs = []
+    outputs = {}
+    for source in sources:
+        if source.endswith(".jsonl"):
+            entries = [(entry, None) for entry in _read_manifest(source)]
+        else:
+            entries = [({"input": path}, base) for path, base in _expand(source)
+                       if base is None or
+                       os.path.splitext(path)[1].lower() != EXTENSIONS[target]]
+        for entry, base in entries:
+            job = dict(defaults, **entry)
+            if "output" not in job and (out_dir or not job.get("printer")):
+                job["output"] = _output_path(job["input"], job["to"], out_dir, base)
+            if "output" in job:
+                output = os.path.realpath(job["output"])
+                if output == os.path.realpath(job["input"]):
+                    continue
+                if output in outputs:
+                    raise ValueError("%s and %s would both write %s"
+                                     % (outputs[output], job["input"], job["output"]))
+                outputs[output] = job["input"]
+            jobs.append(job)
+    return jobs
+
+
+def run_batch(jobs, workers=1, stream=None):
+    """Runs jobs in one process or a pool of workers and prints a summary.
+
+    Converters stay warm in each worker between jobs. Returns the list of
+    run_job results in completion order. Progress goes to stream, by
+    default sys.stderr.
+    """
+    stream = stream or sys.stderr
+    start = time.perf_counter()
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        pool = ProcessPoolExecutor(workers)
+        results = (future.result()
+                   for future in as_completed([pool.submit(run_job, job) for job in jobs]))
+    else:
+        pool = None
+        results = map(run_job, jobs)
+    done = []
+    interactive = stream.isatty()
+    try:
+        for result in results:
+            done.append(result)
+            if "error" in result:
+                stream.write("%s%s: %s\n" % ("\n" if interactive else "",
+                                             result["input"], result["error"]))
+            if interactive:
+                rate = len(done) / (time.perf_counter() - start)
+                stream.write("\r%d/%d jobs, %.1f jobs/s" % (len(done), len(jobs), rate))
+                stream.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - start
+    failed = sum("error" in result for result in done)
+    written = sum(result.get("bytes", 0) for result in done)
+    stream.write("%s%d jobs, %d failed, %.2f s, %.1f jobs/s, %.1f MB output\n"
+                 % ("\n" if interactive else "", len(done), failed, elapsed,
+                    len(done) / elapsed if elapsed else 0.0, written / 1e6))
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="to-print", description="Convert and print HTML, PDF, image and ZPL files.",
+        epilog="ZPL output and PDF input need NumPy and pypdfium2: "
+               "pip install 'toPrint[cli]'")
+    commands = parser.add_subparsers(dest="command")
+
+    convert = commands.add_parser("convert", help="convert a single file")
+    convert.add_argument("input")
+    convert.add_argument("-o", "--output", help="output file (default: next to input)")
+    _add_conversion_options(convert)
+
+    batch = commands.add_parser(
+        "batch", help="convert many files in one process",
+        description="Convert every file named by directories, glob patterns "
+                    "or JSONL manifests (one JSON job per line).")
+    batch.add_argument("sources", nargs="+", help="directory, glob or .jsonl manifest")
+    batch.add_argument("--out-dir", help="directory for output files")
+    batch.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                       help="parallel worker processes (default: CPU count)")
+    _add_conversion_options(batch)
+
+    daemon = commands.add_parser(
+        "daemon", help="serve jobs with converters kept warm",
+        description="Accept run_job JSON jobs over localhost HTTP and/or a Unix "
+                    "socket until interrupted.")
+    daemon.add_argument("--host", default="127.0.0.1")
+    daemon.add_argument("--port", type=int, default=8631,
+                        help="HTTP port, 0 to disable HTTP (default: 8631)")
+    daemon.add_argument("--socket", help="also listen on this Unix socket")
+    daemon.add_argument("-j", "--workers", type=int, default=4,
+                        help="jobs converted at once (default: 4)")
+    daemon.add_argument("--max-pending", type=int, default=1024,
+                        help="queued jobs before submissions are refused (default: 1024)")
+    daemon.add_argument("--render-workers", type=int, default=2,
+                        help="HTML renderer processes, 0 to render in the job "
+                             "threads one at a time (default: 2)")
+    daemon.add_argument("--root", help="directory jobs may read and write "
+                                       "(default: the current directory)")
+    daemon.add_argument("--allow-printer", action="append", default=[],
+                        metavar="HOST[:PORT]", help="printer jobs may send to; repeatable")
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    if args.command == "convert":
+        job = dict(_options(args), input=args.input, to=args.to)
+        if args.printer:
+            job["printer"] = args.printer
+        if args.output or not args.printer:
+            job["output"] = args.output or _output_path(args.input, args.to, None)
+        result = run_job(job)
+        if "error" in result:
+            sys.stderr.write("%s: %s\n" % (args.input, result["error"]))
+            return 1
+        return 0
+    if args.command == "daemon":
+        from toPrint.daemon import PrintDaemon
+
+        server = PrintDaemon(args.host, args.port or None, args.socket, args.workers,
+                             args.max_pending, args.render_workers,
+                             root=args.root, printers=args.allow_printer)
+        sys.stderr.write("to-print daemon listening on %s\n" % ", ".join(
+            filter(None, ["http://%s:%d" % server.address if server.address else None,
+                          args.socket])))
+        server.serve_forever()
+        return 0
+    try:
+        jobs = collect_jobs(args.sources, args.to, args.out_dir, args.printer,
+                            _options(args))
+    except (OSError, ValueError) as exc:
+        sys.stderr.write("%s\n" % (exc,))
+        return 2
+    if not jobs:
+        sys.stderr.write("no input files found\n")
+        return 1
+    results = run_batch(jobs, args.workers)
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
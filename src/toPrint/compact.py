@@ -0,0 +1,85 @@
+from array import array
+
+
+class TokenArray:
+    """Tokenized documents packed CSR-style into two flat arrays.
+
+    ids holds the interned token indices of all documents back to back and
+    offsets[i]:offsets[i + 1] delimits document i; vocab maps an index back
+    to its token. Indexing gives a document's ids as an array, slicing
+    gives another TokenArray sharing the vocabulary, and neither builds
+    per-token Python objects.
+    """
+
+    def __init__(self, ids=None, offsets=None, vocab=None, _index=None):
+        self.ids = ids if ids is not None else array("I")
+        self.offsets = offsets if offsets is not None else array("Q", [0])
+        self.vocab = vocab if vocab is not None else []
+        self._index = _index
+
+    @classmethod
+    def from_docs(cls, docs):
+        """Builds a TokenArray from an iterable of token lists."""
+        packed = cls()
+        for tokens in docs:
+            packed.append(tokens)
+        return packed
+
+    @property
+    def index(self):
+        """Dictionary mapping each token to its vocab index."""
+        if self._index is None:
+            self._index = {token: i for i, token in enumerate(self.vocab)}
+        return self._index
+
+    def _intern(self, token):
+        """Adds a new token to the vocabulary and returns its index."""
+        self.index[token] = len(self.vocab)
+        self.vocab.append(token)
+        return self.index[token]
+
+    def append(self, tokens):
+        """Appends one document."""
+        index = self.index
+        self.ids.extend([index[token] if token in index else self._intern(token)
+                         for token in tokens])
+        self.offsets.append(len(self.ids))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("TokenArray slices must be contiguous")
+            stop = max(start, stop)
+            base = self.offsets[start]
+            offsets = array("Q", (offset - base for offset in self.offsets[start:stop + 1]))
+            return TokenArray(self.ids[base:self.offsets[stop]], offsets,
+                              self.vocab, self.index)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("TokenArray index out of range")
+        return self.ids[self.offsets[key]:self.offsets[key + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tokens(self, i):
+        """Returns document i as a list of tokens."""
+        vocab = self.vocab
+        return [vocab[j] for j in self[i]]
+
+    def to_lists(self):
+        """Returns all documents as lists of tokens, like toPrint()."""
+        return [self.tokens(i) for i in range(len(self))]
+
+    def to_numpy(self):
+        """Returns (ids, offsets) as NumPy arrays sharing this memory."""
+        import numpy as np
+
+        return (np.frombuffer(self.ids, dtype=self.ids.typecode),
+                np.frombuffer(self.offsets, dtype=self.offsets.typecode))
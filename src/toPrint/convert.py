@@ -0,0 +1,181 @@
+import io
+import os
+import threading
+import time
+
+# Input format for each file extension.
+FORMATS = {
+    ".html": "html", ".htm": "html", ".pdf": "pdf", ".zpl": "zpl",
+    ".png": "image", ".jpg": "image", ".jpeg": "image", ".bmp": "image",
+    ".gif": "image", ".tif": "image", ".tiff": "image",
+}
+# File extension written for each output format.
+EXTENSIONS = {"pdf": ".pdf", "zpl": ".zpl", "png": ".png"}
+
+# Converters created once per process and reused by every job.
+_warm = {}
+# pypdfium2 must not be used from two threads at once.
+_pdfium_lock = threading.Lock()
+
+
+def detect(path):
+    """Returns the input format of path from its extension."""
+    try:
+        return FORMATS[os.path.splitext(path)[1].lower()]
+    except KeyError:
+        raise ValueError("unsupported input file %r" % (path,)) from None
+
+
+def _renderer():
+    renderer = _warm.get("renderer")
+    if renderer is None:
+        warm_up()
+        renderer = _warm["renderer"]
+    return renderer
+
+
+def warm_up(render_workers=0, stylesheets=()):
+    """Starts the HTML renderer used by later conversions in this process.
+
+    With render_workers=0 documents render in the converting thread;
+    otherwise in that many renderer processes, which lets several threads
+    convert HTML at once. Called implicitly by the first HTML conversion.
+    """
+    from toPrint.renderer import RendererPool
+
+    old = _warm.get("renderer")
+    _warm["renderer"] = RendererPool(workers=render_workers, stylesheets=stylesheets)
+    if old is not None:
+        old.close()
+
+
+def _html_to_pdf(data, options):
+    return _renderer().render(data.decode("utf-8"), base_url=options.get("base_url"))
+
+
+def _image_to_pdf(data, options):
+    from PIL import Image
+
+    output = io.BytesIO()
+    Image.open(io.BytesIO(data)).convert("RGB").save(output, "PDF",
+                                                     resolution=options.get("dpi", 203))
+    return output.getvalue()
+
+
+def _image_to_zpl(data, options):
+    from PIL import Image
+
+    from toPrint.dither import dither
+    from toPrint.zpl import image_to_zpl
+
+    image = Image.open(io.BytesIO(data))
+    if options.get("dither"):
+        image = dither(image, options["dither"])
+    return image_to_zpl(image, compression=options.get("compression", "z64")).encode("ascii")
+
+
+def _image_to_png(data, options):
+    from PIL import Image
+
+    output = io.BytesIO()
+    Image.open(io.BytesIO(data)).save(output, "PNG")
+    return output.getvalue()
+
+
+def _pdf_to_zpl(data, options):
+    from toPrint.raster import iter_zpl
+
+    labels = iter_zpl(data, options.get("dpi", 203), options.get("width"),
+                      options.get("dither"), options.get("compression", "z64"))
+    with _pdfium_lock:
+        return "".join(labels).encode("ascii")
+
+
+def _pdf_to_png(data, options):
+    from toPrint.raster import iter_pages
+
+    page = options.get("page", 0)
+    with _pdfium_lock:
+        for index, image in enumerate(iter_pages(data, options.get("dpi", 203),
+                                                 options.get("width"))):
+            if index == page:
+                output = io.BytesIO()
+                image.save(output, "PNG")
+                return output.getvalue()
+    raise ValueError("the PDF has no page %d" % (page,))
+
+
+def _html_to_zpl(data, options):
+    return _pdf_to_zpl(_html_to_pdf(data, options), options)
+
+
+def _html_to_png(data, options):
+    return _pdf_to_png(_html_to_pdf(data, options), options)
+
+
+CONVERTERS = {
+    ("html", "pdf"): _html_to_pdf,
+    ("html", "zpl"): _html_to_zpl,
+    ("html", "png"): _html_to_png,
+    ("image", "pdf"): _image_to_pdf,
+    ("image", "zpl"): _image_to_zpl,
+    ("image", "png"): _image_to_png,
+    ("pdf", "zpl"): _pdf_to_zpl,
+    ("pdf", "png"): _pdf_to_png,
+}
+
+
+def convert(data, source, target, **options):
+    """Converts data (bytes) from format source to format target.
+
+    Formats are "html", "pdf", "image", "zpl" and "png"; options include
+    dpi, width (dots), dither, compression, page and base_url.
+    """
+    if source == target:
+        return data
+    try:
+        converter = CONVERTERS[(source, target)]
+    except KeyError:
+        raise ValueError("cannot convert %s to %s" % (source, target)) from None
+    return converter(data, options)
+
+
+def _parse_printer(printer):
+    host, _, port = printer.partition(":")
+    return host, int(port) if port else 9100
+
+
+def run_job(job):
+    """Runs one conversion job and reports how it went; never raises.
+
+    job is a dict with "input", optional "output", "to" (the output format,
+    default zpl), "printer" ("host[:port]" to send the result to) and any
+    convert() options. Returns a dict with the input, output, byte count,
+    seconds and, on failure, "error".
+    """
+    start = time.perf_counter()
+    result = {"input": None, "output": None}
+    try:
+        job = dict(job)
+        result.update(input=job.get("input"), output=job.get("output"))
+        source = job.pop("input")
+        output = job.pop("output", None)
+        target = job.pop("to", "zpl")
+        printer = job.pop("printer", None)
+        with open(source, "rb") as fh:
+            data = convert(fh.read(), detect(source), target, **job)
+        if output:
+            directory = os.path.dirname(output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(output, "wb") as fh:
+                fh.write(data)
+        if printer:
+            from toPrint.printer import get_pool
+
+            get_pool(*_parse_printer(printer)).send(data)
+        result["bytes"] = len(data)
+    except Exception as exc:
+        result["error"] = "%s: %s" % (type(exc).__name__, exc)
+    result["seconds"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,305 @@
+import importlib.util
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from toPrint import convert
+
+DEFAULT_PORT = 8631
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    server_version = "toPrint"
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _forbidden(self):
+        """Refuses requests for another host name, as sent after DNS rebinding."""
+        host = self.headers.get("Host", "")
+        if not host.endswith("]"):
+            host = host.rsplit(":", 1)[0]
+        if host.strip("[]") in self.server.daemon.hosts:
+            return False
+        self._reply(403, {"error": "forbidden host %r" % (host,)})
+        return True
+
+    def do_GET(self):
+        daemon = self.server.daemon
+        if self._forbidden():
+            return
+        if self.path == "/stats":
+            return self._reply(200, daemon.stats())
+        if self.path.startswith("/jobs/"):
+            status = daemon.status(self.path[len("/jobs/"):])
+            if status is None:
+                return self._reply(404, {"error": "unknown job"})
+            return self._reply(200, status)
+        self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self._forbidden():
+            return
+        if self.path != "/jobs":
+            return self._reply(404, {"error": "not found"})
+        # Browsers cannot send this cross-site without a CORS preflight,
+        # which is never answered.
+        if self.headers.get_content_type() != "application/json":
+            return self._reply(415, {"error": "Content-Type must be application/json"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+        except ValueError as exc:
+            return self._reply(400, {"error": str(exc)})
+        status, reply = self.server.daemon.handle({"op": "submit", "job": body})
+        self._reply(status, reply)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, answered by one JSON line."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                _, reply = 400, {"error": str(exc)}
+            else:
+                _, reply = self.server.daemon.handle(request)
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class PrintDaemon:
+    """A long-running job server keeping converters and printers warm.
+
+    Jobs are convert.run_job dicts, accepted over localhost HTTP
+    (POST /jobs, GET /jobs/<id>, GET /stats) and/or a Unix socket speaking
+    one JSON request per line ({"op": "submit", "job": {...}},
+    {"op": "status", "id": ...} or {"op": "stats"}); a submitted list of
+    jobs gets a list of IDs. workers jobs run at once in threads sharing the
+    warm renderer and the printer connection pools, and at most max_pending
+    jobs may wait or run: further submissions are refused with HTTP 503
+    rather than queued without bound. The states of the last keep finished
+    jobs stay available.
+
+    Anyone able to reach the daemon can submit jobs, so jobs may only read
+    and write files under root (the working directory by default; relative
+    paths start there) and send to the "host[:port]" printers listed in
+    printers. The HTTP server only answers requests addressed to its own
+    host name and takes jobs only as application/json, so web pages cannot
+    forge them. The Unix socket is accessible to the daemon's user only.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, socket_path=None,
+                 workers=4, max_pending=1024, render_workers=2, keep=10000,
+                 root=None, printers=()):
+        self.max_pending = max_pending
+        self.keep = keep
+        self.root = os.path.realpath(root or os.getcwd())
+        self.printers = {convert._parse_printer(printer) for printer in printers}
+        self.hosts = {"localhost", "127.0.0.1", "::1", host}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="toPrint-job")
+        self._jobs = OrderedDict()
+        self._finished = 0
+        self._pending = 0
+        self._counts = {"submitted": 0, "done": 0, "failed": 0, "rejected": 0}
+        self._seconds = 0.0
+        self._started = time.time()
+        self._lock = threading.Lock()
+        # Without weasyprint, HTML jobs fail one by one with an ImportError.
+        if importlib.util.find_spec("weasyprint") is not None:
+            convert.warm_up(render_workers)
+        self._servers = []
+        if port is not None:
+            server = ThreadingHTTPServer((host, port), _HTTPHandler)
+            server.daemon_threads = True
+            self._servers.append(server)
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self._servers.append(_UnixServer(socket_path, _UnixHandler))
+            os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+        for server in self._servers:
+            server.daemon = self
+        self._threads = []
+
+    @property
+    def address(self):
+        """The (host, port) the HTTP server listens on, or None."""
+        for server in self._servers:
+            if isinstance(server, ThreadingHTTPServer):
+                return server.server_address[:2]
+        return None
+
+    def submit(self, job):
+        """Queues a run_job dict and returns its ID.
+
+        A list of jobs is queued all or nothing and gets a list of IDs.
+        Raises ValueError for a job outside root or the allowed printers,
+        and queue.Full when the jobs would exceed max_pending.
+        """
+        jobs = [self._check(entry) for entry in (job if isinstance(job, list) else [job])]
+        ids = [uuid.uuid4().hex for _ in jobs]
+        with self._lock:
+            if self._pending + len(jobs) > self.max_pending:
+                self._counts["rejected"] += len(jobs)
+                raise queue.Full("%d jobs pending, limit %d"
+                                 % (self._pending, self.max_pending))
+            self._pending += len(jobs)
+            self._counts["submitted"] += len(jobs)
+            now = time.time()
+            for job_id in ids:
+                self._jobs[job_id] = {"id": job_id, "state": "queued", "submitted": now}
+        for job_id, entry in zip(ids, jobs):
+            self._executor.submit(self._run, job_id, entry)
+        return ids if isinstance(job, list) else ids[0]
+
+    def _check(self, job):
+        """Returns job with its paths made absolute; raises ValueError if refused."""
+        if not isinstance(job, dict) or not isinstance(job.get("input"), str):
+            raise ValueError("a job needs an input path")
+        job = dict(job)
+        for name in ("input", "output"):
+            path = job.get(name)
+            if path is None:
+                continue
+            if not isinstance(path, str):
+                raise ValueError("%s must be a path" % (name,))
+            path = os.path.realpath(os.path.join(self.root, path))
+            if os.path.commonpath([path, self.root]) != self.root:
+                raise ValueError("%s %r is outside %s" % (name, job[name], self.root))
+            job[name] = path
+        printer = job.get("printer")
+        if printer is not None and (not isinstance(printer, str) or
+                                    convert._parse_printer(printer) not in self.printers):
+            raise ValueError("printer %r is not allowed" % (printer,))
+        return job
+
+    def _run(self, job_id, job):
+        with self._lock:
+            self._jobs[job_id]["state"] = "running"
+        result = convert.run_job(job)
+        with self._lock:
+            self._pending -= 1
+            failed = "error" in result
+            self._counts["failed" if failed else "done"] += 1
+            self._seconds += result["seconds"]
+            record = self._jobs[job_id]
+            record.update(result, state="failed" if failed else "done")
+            self._jobs.move_to_end(job_id)
+            self._finished += 1
+            # Finished jobs sit at the end in completion order; drop the oldest.
+            while self._finished > self.keep:
+                for old_id, old in self._jobs.items():
+                    if old["state"] in ("done", "failed"):
+                        del self._jobs[old_id]
+                        self._finished -= 1
+                        break
+
+    def status(self, job_id):
+        """Returns the state of a job as a dict, or None if unknown."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record is not None else None
+
+    def stats(self):
+        """Returns job counts, pending jobs, throughput and renderer stats."""
+        with self._lock:
+            stats = dict(self._counts, pending=self._pending,
+                         max_pending=self.max_pending,
+                         uptime=time.time() - self._started)
+            finished = self._counts["done"] + self._counts["failed"]
+            if finished:
+                stats["mean_seconds"] = self._seconds / finished
+        renderer = convert._warm.get("renderer")
+        if renderer is not None:
+            stats["renderer"] = renderer.stats()
+        return stats
+
+    def handle(self, request):
+        """Answers one protocol request; returns (HTTP status, reply dict)."""
+        op = request.get("op") if isinstance(request, dict) else None
+        if op == "stats":
+            return 200, self.stats()
+        if op == "status":
+            status = self.status(request.get("id"))
+            if status is None:
+                return 404, {"error": "unknown job"}
+            return 200, status
+        if op != "submit":
+            return 400, {"error": "unknown op %r" % (op,)}
+        job = request.get("job")
+        try:
+            job_id = self.submit(job)
+        except queue.Full as exc:
+            return 503, {"error": "busy: %s" % (exc,)}
+        except ValueError as exc:
+            return 400, {"error": str(exc)}
+        return 202, {"ids" if isinstance(job, list) else "id": job_id}
+
+    def start(self):
+        """Serves requests in background threads."""
+        for server in self._servers:
+            # A short poll interval keeps close() quick.
+            thread = threading.Thread(target=server.serve_forever, args=(0.1,),
+                                      daemon=True, name="toPrint-daemon")
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def serve_forever(self):
+        """Serves requests until interrupted, then shuts down."""
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops accepting requests and finishes the queued jobs."""
+        for server in self._servers:
+            if self._threads:
+                server.shutdown()
+            server.server_close()
+        self._threads = []
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._executor.shutdown()
+        renderer = convert._warm.pop("renderer", None)
+        if renderer is not None:
+            renderer.close()
+        from toPrint.printer import close_pools
+
+        close_pools()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
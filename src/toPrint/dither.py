@@ -0,0 +1,102 @@
+METHODS = ("threshold", "bayer", "floyd-steinberg", "pillow")
+
+
+def _gray(image):
+    """Returns image as a float32 array of grey levels 0-255."""
+    import numpy as np
+
+    if hasattr(image, "convert"):
+        image = image.convert("L")
+    pixels = np.asarray(image, dtype=np.float32)
+    if pixels.ndim == 3:
+        pixels = pixels[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return pixels
+
+
+def _to_image(ink):
+    """Turns a boolean ink array into a 1-bit Pillow image."""
+    from PIL import Image
+
+    return Image.fromarray(~ink)
+
+
+def _bayer_matrix(size):
+    """Returns the size x size Bayer index matrix; size is a power of two."""
+    import numpy as np
+
+    if size < 2 or size & (size - 1):
+        raise ValueError("Bayer matrix size must be a power of two")
+    matrix = np.zeros((1, 1))
+    while matrix.shape[0] < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2],
+                           [4 * matrix + 3, 4 * matrix + 1]])
+    return matrix
+
+
+def threshold(image, level=128):
+    """Puts ink on every pixel darker than level."""
+    return _to_image(_gray(image) < level)
+
+
+def bayer(image, size=4):
+    """Ordered dithering against a tiled size x size Bayer matrix."""
+    import numpy as np
+
+    pixels = _gray(image)
+    thresholds = (_bayer_matrix(size) + 0.5) * (255.0 / (size * size))
+    height, width = pixels.shape
+    tiled = np.tile(thresholds, (-(-height // size), -(-width // size)))
+    return _to_image(pixels < tiled[:height, :width])
+
+
+def floyd_steinberg(image, level=128):
+    """Floyd-Steinberg error diffusion, vectorized along anti-diagonals.
+
+    Pixel (y, x) only depends on pixels with a smaller x + 2y, so all
+    pixels sharing that value are quantized together with NumPy. The
+    result is identical to the classic pixel-by-pixel scan, in
+    width + 2 * height vector steps instead of width * height Python ones.
+    """
+    import numpy as np
+
+    pixels = _gray(image).copy()
+    height, width = pixels.shape
+    ink = np.zeros((height, width), dtype=bool)
+    rows = np.arange(height)
+    for step in range(width + 2 * (height - 1)):
+        ys = rows[max(0, (step - width + 2) // 2):min(height, step // 2 + 1)]
+        xs = step - 2 * ys
+        old = pixels[ys, xs]
+        black = old < level
+        ink[ys, xs] = black
+        error = old - np.where(black, 0.0, 255.0)
+        right = xs + 1 < width
+        pixels[ys[right], xs[right] + 1] += error[right] * (7 / 16)
+        below = ys + 1 < height
+        ys, xs, error = ys[below] + 1, xs[below], error[below]
+        left = xs > 0
+        pixels[ys[left], xs[left] - 1] += error[left] * (3 / 16)
+        pixels[ys, xs] += error * (5 / 16)
+        right = xs + 1 < width
+        pixels[ys[right], xs[right] + 1] += error[right] * (1 / 16)
+    return _to_image(ink)
+
+
+def pillow(image):
+    """Pillow's own Floyd-Steinberg convert("1"), for comparison."""
+    if not hasattr(image, "convert"):
+        from PIL import Image
+
+        image = Image.fromarray(_gray(image).astype("uint8"))
+    return image.convert("1")
+
+
+def dither(image, method="floyd-steinberg", **options):
+    """Converts image to a 1-bit Pillow image with the named method."""
+    functions = {"threshold": threshold, "bayer": bayer,
+                 "floyd-steinberg": floyd_steinberg, "pillow": pillow}
+    try:
+        function = functions[method]
+    except KeyError:
+        raise ValueError("dither method must be one of %r" % (METHODS,)) from None
+    return function(image, **options)
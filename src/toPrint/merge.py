@@ -0,0 +1,32 @@
+import io
+
+
+def _open(source):
+    """Wraps in-memory PDF data in a file object for pypdf."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def merge_pdfs(sources, output):
+    """Concatenates PDFs into one print job without re-rendering them.
+
+    sources is an iterable of paths, bytes or binary file objects; their
+    page objects, fonts and images are copied as they are. Identical objects
+    from different sources, such as the same font or logo embedded in every
+    one-page PDF, are stored once. This is not streaming: pypdf keeps every
+    source and the whole output in memory until it is written, so merge very
+    large batches in parts. output is a path or a binary file object.
+    Returns the number of pages written.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    pages = 0
+    for source in sources:
+        for page in PdfReader(_open(source)).pages:
+            writer.add_page(page)
+            pages += 1
+    writer.compress_identical_objects()
+    writer.write(output)
+    return pages
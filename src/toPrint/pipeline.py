@@ -0,0 +1,136 @@
+import io
+import time
+
+ACCEPTS = ("buffer", "bytes", "file")
+
+
+class BufferReader(io.RawIOBase):
+    """A read-only, seekable file object over a buffer, without copying it.
+
+    Only the bytes actually read are copied, into the caller's buffer; the
+    count is kept in bytes_read.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        chunk = self._view[self._position:self._position + len(target)]
+        target[:len(chunk)] = chunk
+        self._position += len(chunk)
+        self.bytes_read += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+class Stage:
+    """One step of a Pipeline.
+
+    func receives one argument per input stage and returns an object
+    supporting the buffer protocol (bytes, bytearray, memoryview, a NumPy
+    array...), ideally a slice or view of its input when it only trims or
+    reinterprets data. accepts selects what func receives: "buffer" a
+    memoryview, "bytes" a bytes copy, "file" a BufferReader.
+    """
+
+    def __init__(self, name, func, inputs, accepts="buffer"):
+        if accepts not in ACCEPTS:
+            raise ValueError("accepts must be one of %r" % (ACCEPTS,))
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.accepts = accepts
+
+
+class Pipeline:
+    """A graph of conversion stages passing buffers instead of copies.
+
+    Stages are added with the names of the stages they read from (the
+    pipeline input when none are given) and run in the order added, so the
+    graph is acyclic by construction. Every hop hands over a memoryview of
+    the previous output; a fan-out shares one buffer between its readers.
+    After run(), stats holds per stage the bytes in and out, the bytes the
+    framework had to copy for it ("copied"), the bytes of newly allocated
+    output rather than a view of an input ("allocated"), and the seconds
+    spent.
+    """
+
+    INPUT = "input"
+
+    def __init__(self):
+        self.stages = []
+        self.stats = {}
+
+    def add(self, name, func, after=None, accepts="buffer"):
+        """Adds a stage reading the output of after (a name or list of names)."""
+        known = {stage.name for stage in self.stages} | {self.INPUT}
+        if name in known:
+            raise ValueError("stage %r already exists" % (name,))
+        inputs = [self.INPUT] if after is None else (
+            [after] if isinstance(after, str) else list(after))
+        for source in inputs:
+            if source not in known:
+                raise ValueError("stage %r reads unknown stage %r" % (name, source))
+        self.stages.append(Stage(name, func, inputs, accepts))
+        return self
+
+    def sinks(self):
+        """Names of the stages no other stage reads from."""
+        read = {source for stage in self.stages for source in stage.inputs}
+        return [stage.name for stage in self.stages if stage.name not in read]
+
+    def run(self, data):
+        """Runs every stage on data and returns {sink name: memoryview}."""
+        outputs = {self.INPUT: memoryview(data).cast("B")}
+        self.stats = {}
+        for stage in self.stages:
+            views = [outputs[source] for source in stage.inputs]
+            copied = 0
+            if stage.accepts == "bytes":
+                args = [bytes(view) for view in views]
+                copied = sum(view.nbytes for view in views)
+            elif stage.accepts == "file":
+                args = [BufferReader(view) for view in views]
+            else:
+                args = views
+            start = time.perf_counter()
+            result = stage.func(*args)
+            seconds = time.perf_counter() - start
+            if stage.accepts == "file":
+                copied = sum(reader.bytes_read for reader in args)
+            if isinstance(result, str):
+                result = result.encode("utf-8")
+            output = memoryview(result).cast("B")
+            owners = {id(view.obj) for view in views}
+            self.stats[stage.name] = {
+                "bytes_in": sum(view.nbytes for view in views),
+                "bytes_out": output.nbytes,
+                "copied": copied,
+                "allocated": 0 if id(output.obj) in owners else output.nbytes,
+                "seconds": seconds,
+            }
+            outputs[stage.name] = output
+        return {name: outputs[name] for name in self.sinks()}
+
+    def total_copied(self):
+        """Bytes copied or newly allocated over the whole last run."""
+        return sum(stat["copied"] + stat["allocated"] for stat in self.stats.values())
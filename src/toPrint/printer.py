@@ -0,0 +1,191 @@
+import queue
+import select
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_PORT = 9100
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _is_stale(sock):
+    """Tells whether the printer has closed the connection since last use."""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        while readable:
+            # Printers rarely talk on raw ports; discard any status output.
+            if not sock.recv(4096):
+                return True
+            readable, _, _ = select.select([sock], [], [], 0)
+    except OSError:
+        return True
+    return False
+
+
+class ConnectionPool:
+    """Persistent raw-socket (port 9100) connections to one network printer.
+
+    Jobs passed to submit() are queued and written by one sender thread per
+    connection, started on demand up to max_connections. A sender keeps its
+    socket open between jobs and pipelines every job waiting in the queue,
+    up to pipeline of them, into a single write. Connections the printer
+    dropped are reopened, retrying with exponential backoff.
+    """
+
+    def __init__(self, host, port=DEFAULT_PORT, max_connections=1, timeout=10.0,
+                 retries=3, backoff=0.5, max_backoff=30.0, pipeline=64):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pipeline = pipeline
+        self.connects = 0
+        self._queue = queue.Queue()
+        self._senders = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        """Opens a keep-alive connection to the printer."""
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connects += 1
+        return sock
+
+    def _write(self, sock, payload):
+        """Writes payload, reconnecting with backoff; returns the socket.
+
+        Only a write of which nothing was sent yet is retried, for instance
+        on a connection the printer dropped while idle. If part of payload
+        went out, the error is raised without resending, since the printer
+        may already have printed the jobs it received.
+        """
+        view = memoryview(payload)
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            if sock is not None and _is_stale(sock):
+                sock.close()
+                sock = None
+            sent = 0
+            try:
+                if sock is None:
+                    sock = self._connect()
+                while sent < len(view):
+                    sent += sock.send(view[sent:])
+                return sock
+            except OSError:
+                if sock is not None:
+                    sock.close()
+                    sock = None
+                if sent or attempt == self.retries:
+                    raise
+                time.sleep(delay)
+                delay = min(2 * delay, self.max_backoff)
+
+    def _take_batch(self, first):
+        """Collects the jobs already waiting behind first, up to pipeline."""
+        batch = [first]
+        while len(batch) < self.pipeline:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _sender(self):
+        sock = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                # Cancelled jobs are dropped; the rest can no longer be cancelled.
+                batch = [(data, future) for data, future in self._take_batch(item)
+                         if future.set_running_or_notify_cancel()]
+                if not batch:
+                    continue
+                try:
+                    sock = self._write(sock, b"".join(data for data, _ in batch))
+                except Exception as exc:
+                    if sock is not None:
+                        sock.close()
+                    sock = None
+                    for _, future in batch:
+                        future.set_exception(exc)
+                else:
+                    for data, future in batch:
+                        future.set_result(len(data))
+        finally:
+            if sock is not None:
+                sock.close()
+            # Lets submit() start a replacement should this thread ever die.
+            with self._lock:
+                self._senders.remove(threading.current_thread())
+
+    def submit(self, data):
+        """Queues a job (bytes or str) and returns a Future set once sent."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("connection pool is closed")
+            self._queue.put((data, future))
+            busy = self._queue.qsize() > 1
+            if not self._senders or busy and len(self._senders) < self.max_connections:
+                sender = threading.Thread(target=self._sender, daemon=True,
+                                          name="toPrint-%s:%d" % (self.host, self.port))
+                sender.start()
+                self._senders.append(sender)
+        return future
+
+    def send(self, data):
+        """Sends a job and waits until it has been written to the printer."""
+        return self.submit(data).result()
+
+    def close(self):
+        """Sends the queued jobs, then closes every connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            senders = list(self._senders)
+            for _ in senders:
+                self._queue.put(None)
+        for sender in senders:
+            sender.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_pool(host, port=DEFAULT_PORT, **options):
+    """Returns the shared ConnectionPool for a printer, creating it once."""
+    with _pools_lock:
+        pool = _pools.get((host, port))
+        if pool is None or pool._closed:
+            pool = _pools[(host, port)] = ConnectionPool(host, port, **options)
+        return pool
+
+
+def close_pools():
+    """Closes every pool created by get_pool()."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,65 @@
+from functools import partial
+
+from toPrint.dither import dither as dither_image
+from toPrint.zpl import image_to_zpl
+
+DEFAULT_DPI = 203
+
+
+def iter_pages(source, dpi=DEFAULT_DPI, width=None, grayscale=True):
+    """Yields the pages of a PDF as Pillow images, rendering one at a time.
+
+    source is a path, bytes or a binary file object. Pages are rendered at
+    dpi, or scaled to width dots when width is given. Only the page being
+    rendered is held, whatever the page count.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            try:
+                scale = width / page.get_width() if width else dpi / 72.0
+                image = page.render(scale=scale, grayscale=grayscale).to_pil()
+            finally:
+                page.close()
+            yield image
+    finally:
+        pdf.close()
+
+
+def iter_raster(source, dpi=DEFAULT_DPI, width=None, dither=None):
+    """Yields the pages of a PDF as 1-bit images.
+
+    dither is a toPrint.dither method name such as "bayer", or a callable
+    turning a greyscale page into a 1-bit image; by default Pillow's
+    Floyd-Steinberg convert("1") is used.
+    """
+    if isinstance(dither, str):
+        dither = partial(dither_image, method=dither)
+    for page in iter_pages(source, dpi, width):
+        yield page.convert("1") if dither is None else dither(page)
+
+
+def iter_zpl(source, dpi=DEFAULT_DPI, width=None, dither=None, compression="z64"):
+    """Yields one ZPL label per PDF page."""
+    for page in iter_raster(source, dpi, width, dither):
+        yield image_to_zpl(page, compression=compression)
+
+
+def print_pdf(source, printer, dpi=DEFAULT_DPI, width=None, dither=None,
+              compression="z64"):
+    """Rasterizes a PDF and sends it to a label printer page by page.
+
+    printer is a send callable or an object with send(), such as a
+    ConnectionPool. Each page is sent as soon as it is encoded, so the
+    first label prints before later pages are rendered. Returns the number
+    of pages sent.
+    """
+    send = getattr(printer, "send", printer)
+    pages = 0
+    for label in iter_zpl(source, dpi, width, dither, compression):
+        send(label)
+        pages += 1
+    return pages
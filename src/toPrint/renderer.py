@@ -0,0 +1,159 @@
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from threading import Lock
+
+# Render latencies kept for RendererPool.stats() percentiles.
+_LATENCY_WINDOW = 4096
+_WARMUP_HTML = "<p>toPrint</p>"
+
+# Warm state of a pool worker process, installed by _init_renderer.
+_state = {}
+# weasyprint is not thread-safe: in-process renders of every pool take turns.
+_inline_lock = Lock()
+
+
+def _font_configuration():
+    """Creates a weasyprint FontConfiguration (its module moved in v53)."""
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+    except ImportError:
+        from weasyprint.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+class _RenderState:
+    """The font configuration and parsed stylesheets of one pool.
+
+    Per-render stylesheets are parsed once and kept in an LRU cache bound
+    to this state's font configuration.
+    """
+
+    def __init__(self, stylesheets):
+        from weasyprint import CSS
+
+        self.font_config = _font_configuration()
+        self.stylesheets = [CSS(string=css, font_config=self.font_config)
+                            for css in stylesheets]
+        self.stylesheet = lru_cache(maxsize=64)(self._parse)
+
+    def _parse(self, css):
+        from weasyprint import CSS
+
+        return CSS(string=css, font_config=self.font_config)
+
+    def render(self, html, stylesheets, base_url):
+        """Renders one document to PDF bytes; returns (pdf, seconds)."""
+        from weasyprint import HTML
+
+        start = time.perf_counter()
+        extra = [self.stylesheet(css) for css in stylesheets]
+        pdf = HTML(string=html, base_url=base_url).write_pdf(
+            stylesheets=self.stylesheets + extra, font_config=self.font_config)
+        return pdf, time.perf_counter() - start
+
+
+def _init_renderer(stylesheets, warmup):
+    """Loads fonts and parses the shared stylesheets in a worker process."""
+    state = _state["renderer"] = _RenderState(stylesheets)
+    if warmup:
+        state.render(_WARMUP_HTML, (), None)
+
+
+def _render(html, stylesheets, base_url):
+    """Renders one document in a worker process with its warm state."""
+    return _state["renderer"].render(html, stylesheets, base_url)
+
+
+class RendererPool:
+    """HTML to PDF rendering with weasyprint state kept warm across jobs.
+
+    Every worker process loads the font configuration and parses the shared
+    stylesheets (CSS source strings) once, then renders any number of
+    documents with them; per-render stylesheets are parsed once per worker
+    too. With workers=0 documents are rendered in the calling thread, with
+    state of the pool's own; such renders run one at a time across every
+    pool in the process.
+    """
+
+    def __init__(self, workers=2, stylesheets=(), base_url=None, warmup=True):
+        self.base_url = base_url
+        self._latencies = deque(maxlen=_LATENCY_WINDOW)
+        self._count = 0
+        self._total = 0.0
+        self._lock = Lock()
+        stylesheets = tuple(stylesheets)
+        if workers:
+            self._pool = ProcessPoolExecutor(workers, initializer=_init_renderer,
+                                             initargs=(stylesheets, warmup))
+        else:
+            self._pool = None
+            self._state = _RenderState(stylesheets)
+            if warmup:
+                self._render_inline(_WARMUP_HTML, (), None)
+
+    def _render_inline(self, html, stylesheets, base_url):
+        with _inline_lock:
+            return self._state.render(html, stylesheets, base_url)
+
+    def _record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            self._count += 1
+            self._total += seconds
+
+    def submit(self, html, stylesheets=(), base_url=None):
+        """Queues a render and returns a Future resolving to the PDF bytes."""
+        base_url = base_url or self.base_url
+        result = Future()
+        if self._pool is None:
+            try:
+                pdf, seconds = self._render_inline(html, tuple(stylesheets), base_url)
+            except Exception as exc:
+                result.set_exception(exc)
+            else:
+                self._record(seconds)
+                result.set_result(pdf)
+            return result
+
+        def done(future):
+            try:
+                pdf, seconds = future.result()
+            except Exception as exc:
+                result.set_exception(exc)
+            else:
+                self._record(seconds)
+                result.set_result(pdf)
+
+        self._pool.submit(_render, html, tuple(stylesheets), base_url).add_done_callback(done)
+        return result
+
+    def render(self, html, stylesheets=(), base_url=None):
+        """Renders html and returns the PDF bytes."""
+        return self.submit(html, stylesheets, base_url).result()
+
+    def stats(self):
+        """Returns render count and latency statistics in seconds."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            count, total = self._count, self._total
+        if not latencies:
+            return {"count": count}
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {"count": count, "mean": total / count, "p50": percentile(0.5),
+                "p95": percentile(0.95), "max": latencies[-1]}
+
+    def close(self):
+        """Shuts the worker processes down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,167 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+
+# Sorts after every job, so workers finish the queue before stopping.
+_STOP = (float("inf"), 0, None, None, None)
+
+
+class _PrinterQueue:
+    """The queues and worker threads serving one printer."""
+
+    def __init__(self, name, send, render_workers, send_workers, queue_size):
+        self.name = name
+        self.send = getattr(send, "send", send)
+        self.pending = queue.PriorityQueue(queue_size)
+        self.render_workers = render_workers
+        # Jobs are numbered as renderers take them and handed to the senders
+        # in that order through a reorder buffer, so a job rendering faster
+        # than the one before it still waits its turn.
+        self._taken = itertools.count()
+        self._take_lock = threading.Lock()
+        self._rendered = {}
+        self._next = 0
+        self._closing = False
+        self._ready = threading.Condition()
+        self.renderers = [self._start(self._render_loop, "render", i)
+                          for i in range(render_workers)]
+        self.senders = [self._start(self._send_loop, "send", i)
+                        for i in range(send_workers)]
+
+    def _start(self, target, role, number):
+        thread = threading.Thread(target=target, daemon=True,
+                                  name="toPrint-%s-%s-%d" % (self.name, role, number))
+        thread.start()
+        return thread
+
+    def _render_loop(self):
+        while True:
+            with self._take_lock:
+                _, _, job, render, future = self.pending.get()
+                if future is None:
+                    break
+                ticket = next(self._taken)
+            # Cancelled and failed jobs leave an empty slot in the buffer.
+            entry = None
+            if future.set_running_or_notify_cancel():
+                try:
+                    data = render(job) if render is not None else job
+                    if isinstance(data, str):
+                        data = data.encode("utf-8")
+                except Exception as exc:
+                    future.set_exception(exc)
+                else:
+                    entry = (data, future)
+            self._hand_over(ticket, entry)
+
+    def _hand_over(self, ticket, entry):
+        """Puts a rendered job in the buffer, at most one job per worker ahead."""
+        with self._ready:
+            while ticket >= self._next + self.render_workers:
+                self._ready.wait()
+            self._rendered[ticket] = entry
+            self._ready.notify_all()
+
+    def _next_rendered(self):
+        """Returns the next rendered job in order, or None once closed."""
+        with self._ready:
+            while True:
+                if self._next in self._rendered:
+                    entry = self._rendered.pop(self._next)
+                    self._next += 1
+                    self._ready.notify_all()
+                    if entry is not None:
+                        return entry
+                elif self._closing:
+                    return None
+                else:
+                    self._ready.wait()
+
+    def _send_loop(self):
+        while True:
+            entry = self._next_rendered()
+            if entry is None:
+                break
+            data, future = entry
+            try:
+                self.send(data)
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(len(data))
+
+    def close(self):
+        for _ in self.renderers:
+            self.pending.put(_STOP)
+        for thread in self.renderers:
+            thread.join()
+        with self._ready:
+            self._closing = True
+            self._ready.notify_all()
+        for thread in self.senders:
+            thread.join()
+
+
+class Spooler:
+    """In-process print spooler with a priority job queue per printer.
+
+    Each printer gets render_workers threads turning jobs into printer
+    data and send_workers threads delivering it, so the next job renders
+    while the previous one is being sent. Higher priorities are rendered
+    first; equal priorities keep submission order. Rendered jobs reach the
+    senders in the order they were taken from the queue, however long each
+    took to render, so with one send worker they print in that order too.
+    Queues hold at most queue_size jobs per printer, and submit() blocks
+    when one is full.
+    """
+
+    def __init__(self, render_workers=2, send_workers=1, queue_size=256):
+        self.render_workers = render_workers
+        self.send_workers = send_workers
+        self.queue_size = queue_size
+        self._printers = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def add_printer(self, name, send):
+        """Registers a printer.
+
+        send is a callable taking the job bytes, or an object with a send()
+        method such as a ConnectionPool.
+        """
+        with self._lock:
+            if name in self._printers:
+                raise ValueError("printer %r is already registered" % (name,))
+            self._printers[name] = _PrinterQueue(name, send, self.render_workers,
+                                                 self.send_workers, self.queue_size)
+
+    def submit(self, printer, job, render=None, priority=0, timeout=None):
+        """Queues a job and returns a Future set once it has been sent.
+
+        job is printer data (bytes or str), or any object that render turns
+        into printer data. With the printer's queue full this blocks for up
+        to timeout seconds (forever if None), then raises queue.Full.
+        """
+        try:
+            target = self._printers[printer]
+        except KeyError:
+            raise ValueError("unknown printer %r" % (printer,)) from None
+        future = Future()
+        target.pending.put((-priority, next(self._sequence), job, render, future),
+                           timeout=timeout)
+        return future
+
+    def close(self):
+        """Finishes every queued job, then stops the worker threads."""
+        with self._lock:
+            printers = list(self._printers.values())
+            self._printers.clear()
+        for target in printers:
+            target.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,135 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+# Header: magic, format version, byte order, then document, id and vocab
+# counts and the byte offsets of the offsets table and the vocabulary.
+_MAGIC = b"TPTS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBc2xQQQQQ")
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+_ID_TYPE = "I"
+_OFFSET_TYPE = "Q"
+# Ids written per write() call while streaming documents to disk.
+_FLUSH_IDS = 1 << 16
+
+
+def _align(position, size=8):
+    """Rounds a byte position up to a multiple of size."""
+    return -(-position // size) * size
+
+
+def write_store(path, docs):
+    """Streams tokenized documents into a token store file at path.
+
+    docs is any iterable of token lists, typically iter_toPrint(...), so the
+    corpus never has to fit in memory: ids are flushed as they are produced
+    and only the per-document offsets and the vocabulary are kept until the
+    end. Tokens must be str or int; any other token raises ValueError as
+    soon as it is seen. Returns the number of documents written.
+    """
+    vocab = {}
+    offsets = array(_OFFSET_TYPE, [0])
+    ids = array(_ID_TYPE)
+    total = 0
+    with open(path, "wb") as fh:
+        fh.write(b"\0" * _HEADER.size)
+        for tokens in docs:
+            for token in tokens:
+                index = vocab.get(token)
+                if index is None:
+                    # The vocabulary is stored as JSON, which only keeps
+                    # these types as they are; refuse others up front.
+                    if type(token) not in (str, int):
+                        raise ValueError("tokens must be str or int, not %s"
+                                         % (type(token).__name__,))
+                    index = vocab[token] = len(vocab)
+                ids.append(index)
+            total += len(tokens)
+            offsets.append(total)
+            if len(ids) >= _FLUSH_IDS:
+                ids.tofile(fh)
+                del ids[:]
+        ids.tofile(fh)
+        offsets_at = _align(fh.tell())
+        fh.write(b"\0" * (offsets_at - fh.tell()))
+        offsets.tofile(fh)
+        vocab_at = fh.tell()
+        fh.write(json.dumps(list(vocab)).encode("utf-8"))
+        fh.seek(0)
+        fh.write(_HEADER.pack(_MAGIC, _VERSION, _BYTE_ORDER, len(offsets) - 1,
+                              total, len(vocab), offsets_at, vocab_at))
+    return len(offsets) - 1
+
+
+class TokenStore:
+    """Read-only, memory-mapped view of a file written by write_store().
+
+    Document ids are memoryview slices of the mapping, so opening a store
+    and reading documents at random copies nothing, and any number of
+    processes can map the same file. Only the vocabulary is loaded eagerly.
+    Document views must be released before close() can unmap the file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._mmap)
+        magic, version, byte_order, n_docs, n_ids, n_vocab, offsets_at, vocab_at = header
+        if magic != _MAGIC or version != _VERSION:
+            self._mmap.close()
+            raise ValueError("%s is not a token store" % (path,))
+        if byte_order != _BYTE_ORDER:
+            self._mmap.close()
+            raise ValueError("%s was written with a different byte order" % (path,))
+        self._view = view = memoryview(self._mmap)
+        ids_at = _HEADER.size
+        ids_end = ids_at + n_ids * array(_ID_TYPE).itemsize
+        offsets_end = offsets_at + (n_docs + 1) * array(_OFFSET_TYPE).itemsize
+        self.ids = view[ids_at:ids_end].cast(_ID_TYPE)
+        self.offsets = view[offsets_at:offsets_end].cast(_OFFSET_TYPE)
+        self.vocab = json.loads(bytes(view[vocab_at:]).decode("utf-8"))
+        if len(self.vocab) != n_vocab:
+            self.close()
+            raise ValueError("%s has a truncated vocabulary" % (path,))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("TokenStore index out of range")
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tokens(self, i):
+        """Returns document i as a list of tokens."""
+        vocab = self.vocab
+        return [vocab[j] for j in self[i]]
+
+    def to_numpy(self):
+        """Returns (ids, offsets) as NumPy arrays over the mapping."""
+        import numpy as np
+
+        return (np.frombuffer(self.ids, dtype=_ID_TYPE),
+                np.frombuffer(self.offsets, dtype=_OFFSET_TYPE))
+
+    def close(self):
+        """Releases the views and unmaps the file."""
+        self.ids.release()
+        self.offsets.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,56 @@
+import re
+from functools import lru_cache
+from operator import itemgetter
+
+# {{ name }} placeholders, as used in HTML and ZPL templates alike.
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    """An HTML or ZPL template parsed once for rendering many records.
+
+    The source is split into its static text and {{ name }} placeholders
+    and turned into a single str.format pattern, so rendering a record is
+    one C-level format call. escape, e.g. html.escape, is applied to every
+    substituted value.
+    """
+
+    def __init__(self, source, escape=None):
+        self.source = source
+        self.escape = escape
+        parts = PLACEHOLDER.split(source)
+        self.literals = parts[0::2]
+        self.fields = parts[1::2]
+        pattern = []
+        for i, literal in enumerate(self.literals):
+            pattern.append(literal.replace("{", "{{").replace("}", "}}"))
+            if i < len(self.fields):
+                pattern.append("{%d}" % i)
+        self._format = "".join(pattern).format
+
+    def _values(self, data):
+        values = [data[field] for field in self.fields]
+        if self.escape is not None:
+            values = [self.escape(str(value)) for value in values]
+        return values
+
+    def render(self, data):
+        """Returns the template filled in from the mapping data."""
+        return self._format(*self._values(data))
+
+    def render_many(self, records):
+        """Yields the template rendered for each mapping in records."""
+        fmt = self._format
+        if self.escape is not None or len(self.fields) < 2:
+            for data in records:
+                yield fmt(*self._values(data))
+            return
+        values = itemgetter(*self.fields)
+        for data in records:
+            yield fmt(*values(data))
+
+
+@lru_cache(maxsize=256)
+def compile_template(source, escape=None):
+    """Returns the Template for source, reusing recently compiled ones."""
+    return Template(source, escape)
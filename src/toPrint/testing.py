@@ -0,0 +1,80 @@
+import socket
+import socketserver
+import threading
+
+
+class _JobHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        printer = self.server.printer
+        with printer._lock:
+            printer.connections += 1
+            printer._sockets.add(self.request)
+        try:
+            while True:
+                try:
+                    data = self.request.recv(65536)
+                except OSError:
+                    break
+                if not data:
+                    break
+                with printer._lock:
+                    printer._received.extend(data)
+                    printer.writes += 1
+        finally:
+            with printer._lock:
+                printer._sockets.discard(self.request)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class FakePrinter:
+    """A local TCP stand-in for a raw-port network printer.
+
+    Accepts any number of connections on host:port (a free port by default)
+    and records everything written to it, so printing code can be exercised
+    without hardware. drop_connections() imitates a printer closing idle
+    connections.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.connections = 0
+        self.writes = 0
+        self._received = bytearray()
+        self._sockets = set()
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _JobHandler)
+        self._server.printer = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def received(self):
+        """Everything received so far, as bytes."""
+        with self._lock:
+            return bytes(self._received)
+
+    def drop_connections(self):
+        """Closes every open client connection from the printer side."""
+        with self._lock:
+            sockets = list(self._sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self.drop_connections()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
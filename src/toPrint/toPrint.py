@@ -1,11 +1,284 @@
+import re
+from collections import deque, namedtuple
+from itertools import islice
 
+# Batch methods looked up on the tokenizer, in order of preference. The
+# encode methods only count when they return encodings with a .tokens list;
+# many return token ids instead.
+_BATCH_METHODS = ("batch_tokenize", "tokenize_batch")
+_ENCODE_BATCH_METHODS = ("batch_encode", "encode_batch")
 
-def toPrint(texts, tokenizer, max_len=512):
-    """Converts a list of texts to a list of tokenized documents."""
+# Early stop: a prefix is trusted once it yields this many tokens beyond
+# max_len, so tokens near the cut that could still change are discarded.
+_PREFIX_MARGIN = 8
+# Early stop: characters per wanted token in the first prefix window.
+_PREFIX_CHARS_PER_TOKEN = 8
+_LAST_WORD = re.compile(r"\s+\S*\Z")
+
+Window = namedtuple("Window", "doc start tokens")
+Window.__doc__ = """A slice of document doc's tokens beginning at token start."""
+
+
+def _truncate(tokens, max_len):
+    """Cuts a token list down to max_len tokens; None keeps all of them."""
+    if max_len is not None and len(tokens) > max_len:
+        tokens = tokens[:max_len]
+    return tokens
+
+
+def _chunks(iterable, size):
+    """Yields lists of at most size items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _tokenize_text(tokenizer, text, max_len):
+    """Tokenizes a whole text and truncates the result."""
+    return _truncate(tokenizer.tokenize(text), max_len)
+
+
+def _prefix_cut(text, window):
+    """Returns the last whitespace boundary at or before window, or 0."""
+    if text[window].isspace():
+        return len(text[:window].rstrip())
+    match = _LAST_WORD.search(text, 0, window)
+    return match.start() if match else 0
+
+
+def _tokenize_prefix(tokenizer, text, max_len):
+    """Tokenizes growing prefixes of text until max_len tokens are settled.
+
+    Prefixes end just before whitespace so no word is split, and double in
+    size until they produce max_len plus _PREFIX_MARGIN tokens. Texts that
+    are too short, or have no whitespace to cut at, are tokenized whole.
+    """
+    window = (max_len + _PREFIX_MARGIN) * _PREFIX_CHARS_PER_TOKEN
+    while window < len(text):
+        cut = _prefix_cut(text, window)
+        if cut:
+            tokens = tokenizer.tokenize(text[:cut])
+            if len(tokens) >= max_len + _PREFIX_MARGIN:
+                return tokens[:max_len]
+        window *= 2
+    return _tokenize_text(tokenizer, text, max_len)
+
+
+def _batch_method(tokenizer):
+    """Returns the tokenizer's batch API and whether it encodes, or (None, False)."""
+    for names, encodes in ((_BATCH_METHODS, False), (_ENCODE_BATCH_METHODS, True)):
+        for name in names:
+            method = getattr(tokenizer, name, None)
+            if callable(method):
+                return method, encodes
+    return None, False
+
+
+def _tokenize_batch(texts, tokenizer, max_len, batch_size, early_stop=False):
+    """Tokenizes a list of texts, batching when the tokenizer supports it.
+
+    An encode batch method whose results have no .tokens is abandoned for
+    per-text calls, and not tried again on that tokenizer type.
+    """
+    method, encodes = _batch_method(tokenizer)
+    if early_stop or not batch_size or encodes and type(tokenizer) in _no_token_encoders:
+        method = None
     docs = []
-    for text in texts:
-        tokens = tokenizer.tokenize(text)
-        if len(tokens) > max_len:
-            tokens = tokens[:max_len]
-        docs.append(tokens)
-    return docs
\ No newline at end of file
+    batches = _chunks(texts, batch_size) if method is not None else ()
+    for batch in batches:
+        items = method(batch)
+        if encodes:
+            items = [getattr(item, "tokens", None) for item in items]
+            if any(tokens is None for tokens in items):
+                _no_token_encoders.add(type(tokenizer))
+                break
+        docs.extend(_truncate(tokens, max_len) for tokens in items)
+    tokenize = _tokenize_prefix if early_stop else _tokenize_text
+    docs.extend(tokenize(tokenizer, text, max_len) for text in texts[len(docs):])
+    return docs
+
+
+def _split_cached(texts, tokenizer, max_len, cache):
+    """Looks texts up in a TokenCache.
+
+    Returns the keys, the cached documents (None for misses) and a dict of
+    distinct missing keys to their texts, in first-seen order.
+    """
+    keys = [cache.key(text, tokenizer, max_len) for text in texts]
+    docs = []
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key in missing:
+            cache.hits += 1
+            docs.append(None)
+            continue
+        doc = cache.get(key)
+        if doc is None:
+            missing[key] = text
+        docs.append(doc)
+    return keys, docs, missing
+
+
+def _merge_cached(keys, docs, missing, tokenized, cache):
+    """Stores freshly tokenized misses and yields the documents in order."""
+    computed = dict(zip(missing, tokenized))
+    for key, tokens in computed.items():
+        cache.put(key, tokens)
+    for key, doc in zip(keys, docs):
+        if doc is None:
+            doc = computed[key]
+            if missing.pop(key, None) is None:
+                doc = list(doc)
+        yield doc
+
+
+# Tokenizer types whose encode batch method returned no .tokens.
+_no_token_encoders = set()
+
+# Tokenizer settings installed once per pool process by _init_worker.
+_worker = {}
+
+
+def _init_worker(tokenizer, max_len, batch_size, early_stop):
+    """Stores the tokenizer in a pool process so chunks need not carry it."""
+    _worker.update(tokenizer=tokenizer, max_len=max_len, batch_size=batch_size,
+                   early_stop=early_stop)
+
+
+def _worker_tokenize(texts):
+    """Tokenizes one chunk inside a pool process."""
+    return _tokenize_batch(texts, _worker["tokenizer"], _worker["max_len"],
+                           _worker["batch_size"], _worker["early_stop"])
+
+
+def _iter_pool(texts, tokenizer, max_len, batch_size, early_stop, workers,
+               chunk_size, cache):
+    """Tokenizes chunks of texts in a process pool, yielding in input order.
+
+    With a cache, lookups happen here and only the misses of each chunk are
+    sent to the pool.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                               initargs=(tokenizer, max_len, batch_size, early_stop))
+    pending = deque()
+
+    def collect(entry):
+        future, cached = entry
+        if cached is None:
+            return future.result()
+        return _merge_cached(*cached, future.result(), cache)
+
+    try:
+        for chunk in _chunks(texts, chunk_size):
+            cached = None
+            if cache is not None:
+                cached = _split_cached(chunk, tokenizer, max_len, cache)
+                chunk = list(cached[2].values())
+            pending.append((pool.submit(_worker_tokenize, chunk), cached))
+            if len(pending) >= 2 * workers:
+                yield from collect(pending.popleft())
+        while pending:
+            yield from collect(pending.popleft())
+    finally:
+        for future, _ in pending:
+            future.cancel()
+        pool.shutdown()
+
+
+def _iter_serial(texts, tokenizer, max_len, batch_size, early_stop, chunk_size,
+                 cache):
+    """Tokenizes texts in this process, consulting the cache if one is given."""
+    if cache is None and (not batch_size or early_stop):
+        tokenize = _tokenize_prefix if early_stop else _tokenize_text
+        for text in texts:
+            yield tokenize(tokenizer, text, max_len)
+        return
+    for chunk in _chunks(texts, batch_size or chunk_size):
+        if cache is None:
+            yield from _tokenize_batch(chunk, tokenizer, max_len, batch_size)
+            continue
+        keys, docs, missing = _split_cached(chunk, tokenizer, max_len, cache)
+        tokenized = _tokenize_batch(list(missing.values()), tokenizer, max_len,
+                                    batch_size, early_stop)
+        yield from _merge_cached(keys, docs, missing, tokenized, cache)
+
+
+def iter_toPrint(texts, tokenizer, max_len=512, batch_size=None, workers=None,
+                 chunk_size=256, early_stop=False, cache=None):
+    """Yields tokenized documents one at a time from any iterable of texts.
+
+    Only the current document is held in memory, so texts may be a file
+    object or a generator of arbitrary length. With batch_size set, texts
+    are sent to the tokenizer's batch API (batch_tokenize or
+    tokenize_batch, else batch_encode or encode_batch if they return
+    encodings with .tokens) in groups of that size; tokenizers without one
+    fall back to a tokenize() call per text.
+
+    With workers > 1, chunks of chunk_size texts are tokenized in that many
+    processes. The tokenizer is pickled once per process, results keep the
+    input order, and at most two chunks per process are in flight.
+
+    With early_stop, long texts are tokenized through growing prefixes cut
+    at whitespace instead of in full, so the cost follows max_len rather
+    than the text length. This goes text by text, bypassing batch APIs.
+    It is ignored when max_len is None, as every text is needed in full.
+
+    With a TokenCache passed as cache, repeated texts are served from it and
+    only distinct unseen texts of each chunk reach the tokenizer. Reuse the
+    same TokenCache across calls to share it.
+    """
+    early_stop = early_stop and max_len is not None
+    if workers and workers > 1:
+        yield from _iter_pool(texts, tokenizer, max_len, batch_size, early_stop,
+                              workers, chunk_size, cache)
+    else:
+        yield from _iter_serial(texts, tokenizer, max_len, batch_size, early_stop,
+                                chunk_size, cache)
+
+
+def toPrint(texts, tokenizer, max_len=512, batch_size=None, workers=None,
+            chunk_size=256, early_stop=False, cache=None, output="list"):
+    """Converts a list of texts to a list of tokenized documents.
+
+    output="array" returns a compact TokenArray instead of a list of lists.
+    """
+    docs = iter_toPrint(texts, tokenizer, max_len, batch_size, workers,
+                        chunk_size, early_stop, cache)
+    if output == "list":
+        return list(docs)
+    if output == "array":
+        from toPrint.compact import TokenArray
+
+        return TokenArray.from_docs(docs)
+    raise ValueError("output must be 'list' or 'array', not %r" % (output,))
+
+
+def iter_windows(texts, tokenizer, max_len=512, stride=None, batch_size=None,
+                 workers=None, chunk_size=256, cache=None):
+    """Yields every text as Windows of at most max_len tokens.
+
+    Each text is tokenized once, in full, and cut into windows starting
+    every stride tokens (max_len by default, i.e. no overlap) until the
+    last token is covered, so nothing past max_len is dropped. An empty
+    text yields one empty window. The remaining options are as for
+    iter_toPrint.
+    """
+    if not isinstance(max_len, int) or max_len < 1:
+        raise ValueError("max_len must be a positive int")
+    stride = max_len if stride is None else stride
+    if not 0 < stride <= max_len:
+        raise ValueError("stride must be between 1 and max_len")
+    docs = iter_toPrint(texts, tokenizer, None, batch_size, workers, chunk_size,
+                        cache=cache)
+    for doc, tokens in enumerate(docs):
+        start = 0
+        while True:
+            yield Window(doc, start, tokens[start:start + max_len])
+            if start + max_len >= len(tokens):
+                break
+            start += stride
@@ -0,0 +1,220 @@
+import errno
+import io
+import os
+import posixpath
+import stat
+import threading
+import time
+from collections import OrderedDict
+
+_FILE_MODE = stat.S_IFREG | 0o644
+_DIR_MODE = stat.S_IFDIR | 0o755
+
+
+def _error(cls, code, path):
+    return cls(code, os.strerror(code), path)
+
+
+class _WriteFile(io.BytesIO):
+    """A file opened for writing; its content is committed on close."""
+
+    def __init__(self, fs, path, initial=b""):
+        super().__init__(initial)
+        self.seek(0, io.SEEK_END)
+        self.name = path
+        self._fs = fs
+
+    def flush(self):
+        super().flush()
+        if not self.closed:
+            self._fs._commit(self.name, self.getvalue())
+
+    def close(self):
+        if not self.closed:
+            self._fs._commit(self.name, self.getvalue())
+        super().close()
+
+
+class MemoryFS:
+    """A file system held in RAM, with an interface modelled on os.
+
+    Paths are POSIX style and relative paths start at "/". open() returns
+    ordinary file objects, so conversion stages that accept a path or file
+    object (pypdf, pypdfium2, Pillow, weasyprint) can pass intermediate
+    PDFs and images through it without touching the disk. With a quota in
+    bytes, writes beyond it evict the least recently used files, or raise
+    OSError(ENOSPC) when evict is False.
+    """
+
+    def __init__(self, quota=None, evict=True):
+        self.quota = quota
+        self.evict = evict
+        self.used = 0
+        self._files = OrderedDict()
+        self._times = {}
+        self._dirs = {"/": time.time()}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _norm(path):
+        return posixpath.normpath(posixpath.join("/", os.fspath(path)))
+
+    def _check_parent(self, path):
+        parent = posixpath.dirname(path)
+        if parent not in self._dirs:
+            code = errno.ENOTDIR if parent in self._files else errno.ENOENT
+            raise _error(NotADirectoryError if parent in self._files
+                         else FileNotFoundError, code, path)
+
+    def _commit(self, path, data):
+        """Stores data as the content of path, enforcing the quota."""
+        with self._lock:
+            self._check_parent(path)
+            if path in self._dirs:
+                raise _error(IsADirectoryError, errno.EISDIR, path)
+            old = len(self._files.get(path, b""))
+            if self.quota is not None:
+                needed = self.used - old + len(data) - self.quota
+                victims = []
+                if needed > 0 and self.evict:
+                    for victim, content in self._files.items():
+                        if needed <= 0:
+                            break
+                        if victim != path:
+                            victims.append(victim)
+                            needed -= len(content)
+                if needed > 0:
+                    raise _error(OSError, errno.ENOSPC, path)
+                for victim in victims:
+                    self.remove(victim)
+            self._files[path] = bytes(data)
+            self._files.move_to_end(path)
+            self._times[path] = time.time()
+            self.used += len(data) - old
+
+    def open(self, path, mode="r", encoding=None, errors=None, newline=None):
+        """Opens a file like the built-in open(); modes r, w, a and x."""
+        path = self._norm(path)
+        kind = mode.replace("b", "").replace("t", "")
+        with self._lock:
+            if kind == "r":
+                raw = io.BytesIO(self.read(path))
+                raw.name = path
+            elif kind in ("w", "a", "x"):
+                self._check_parent(path)
+                if path in self._dirs:
+                    raise _error(IsADirectoryError, errno.EISDIR, path)
+                if kind == "x" and path in self._files:
+                    raise _error(FileExistsError, errno.EEXIST, path)
+                initial = self._files.get(path, b"") if kind == "a" else b""
+                raw = _WriteFile(self, path, initial)
+                raw.flush()
+            else:
+                raise ValueError("unsupported mode %r" % (mode,))
+        if "b" in mode:
+            return raw
+        return io.TextIOWrapper(raw, encoding or "utf-8", errors, newline)
+
+    def read(self, path):
+        """Returns the content of a file as bytes."""
+        path = self._norm(path)
+        with self._lock:
+            if path in self._dirs:
+                raise _error(IsADirectoryError, errno.EISDIR, path)
+            try:
+                data = self._files[path]
+            except KeyError:
+                raise _error(FileNotFoundError, errno.ENOENT, path) from None
+            self._files.move_to_end(path)
+        return data
+
+    def write(self, path, data):
+        """Replaces the content of a file with bytes or str data."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._commit(self._norm(path), data)
+        return len(data)
+
+    def listdir(self, path="/"):
+        path = self._norm(path)
+        with self._lock:
+            if path not in self._dirs:
+                self.read(path)
+                raise _error(NotADirectoryError, errno.ENOTDIR, path)
+            return sorted(posixpath.basename(entry)
+                          for entry in list(self._dirs) + list(self._files)
+                          if entry != "/" and posixpath.dirname(entry) == path)
+
+    def mkdir(self, path):
+        path = self._norm(path)
+        with self._lock:
+            if path in self._dirs or path in self._files:
+                raise _error(FileExistsError, errno.EEXIST, path)
+            self._check_parent(path)
+            self._dirs[path] = time.time()
+
+    def makedirs(self, path, exist_ok=False):
+        path = self._norm(path)
+        with self._lock:
+            if path in self._dirs:
+                if not exist_ok:
+                    raise _error(FileExistsError, errno.EEXIST, path)
+                return
+            parent = posixpath.dirname(path)
+            if parent not in self._dirs:
+                self.makedirs(parent, exist_ok=True)
+            self.mkdir(path)
+
+    def stat(self, path):
+        path = self._norm(path)
+        with self._lock:
+            if path in self._dirs:
+                mode, size, mtime = _DIR_MODE, 0, self._dirs[path]
+            elif path in self._files:
+                mode, size, mtime = _FILE_MODE, len(self._files[path]), self._times[path]
+            else:
+                raise _error(FileNotFoundError, errno.ENOENT, path)
+        return os.stat_result((mode, 0, 0, 1, 0, 0, size, mtime, mtime, mtime))
+
+    def exists(self, path):
+        path = self._norm(path)
+        return path in self._dirs or path in self._files
+
+    def isfile(self, path):
+        return self._norm(path) in self._files
+
+    def isdir(self, path):
+        return self._norm(path) in self._dirs
+
+    def remove(self, path):
+        path = self._norm(path)
+        with self._lock:
+            if path in self._dirs:
+                raise _error(IsADirectoryError, errno.EISDIR, path)
+            try:
+                data = self._files.pop(path)
+            except KeyError:
+                raise _error(FileNotFoundError, errno.ENOENT, path) from None
+            del self._times[path]
+            self.used -= len(data)
+
+    unlink = remove
+
+    def rmdir(self, path):
+        path = self._norm(path)
+        with self._lock:
+            if path not in self._dirs or path == "/":
+                raise _error(FileNotFoundError, errno.ENOENT, path)
+            if self.listdir(path):
+                raise _error(OSError, errno.ENOTEMPTY, path)
+            del self._dirs[path]
+
+    def rename(self, src, dst):
+        src, dst = self._norm(src), self._norm(dst)
+        with self._lock:
+            data = self.read(src)
+            self._check_parent(dst)
+            if dst in self._dirs:
+                raise _error(IsADirectoryError, errno.EISDIR, dst)
+            self.remove(src)
+            self._commit(dst, data)
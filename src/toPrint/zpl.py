@@ -0,0 +1,176 @@
+import base64
+import binascii
+import re
+import zlib
+
+from toPrint.template import PLACEHOLDER, compile_template
+
+COMPRESSIONS = ("z64", "ascii", None)
+
+# Runs of three or more identical hex digits, worth replacing by a count.
+_RUN = re.compile(r"([0-9A-F])\1{2,}")
+# Field data of a ZPL label, and the label start and end commands.
+_FIELD_DATA = re.compile(r"\^FD(.*?)\^FS", re.I | re.S)
+_LABEL_FRAME = re.compile(r"^\s*\^XA|\^XZ\s*$", re.I)
+# Luminance weights used for colour arrays (ITU-R 601, as in Pillow).
+_LUMA = (0.299, 0.587, 0.114)
+
+
+def _pixels(image, threshold):
+    """Returns a boolean array, True where the printer should put ink."""
+    import numpy as np
+
+    if hasattr(image, "convert"):
+        if image.mode == "1":
+            return ~np.asarray(image)
+        if "A" in image.getbands():
+            from PIL import Image
+
+            background = Image.new("RGBA", image.size, "white")
+            image = Image.alpha_composite(background, image.convert("RGBA"))
+        return np.asarray(image.convert("L")) < threshold
+    pixels = np.asarray(image)
+    if pixels.dtype == bool:
+        return pixels
+    if pixels.ndim == 3:
+        pixels = pixels[..., :3] @ np.array(_LUMA)
+    return pixels < threshold
+
+
+def pack_image(image, threshold=128):
+    """Packs an image into 1-bit rows, MSB first and 1 for ink.
+
+    image may be a Pillow image, or a NumPy array that is either boolean
+    (True for ink) or grey/RGB levels compared against threshold. Returns
+    the packed bytes and the number of bytes per row.
+    """
+    import numpy as np
+
+    packed = np.packbits(_pixels(image, threshold), axis=1)
+    return packed.tobytes(), packed.shape[1]
+
+
+def _repeat_count(n):
+    """Encodes a repeat count with the ZPL count letters G-Y and g-z."""
+    count = "z" * (n // 400)
+    n %= 400
+    if n >= 20:
+        count += chr(ord("f") + n // 20)
+        n %= 20
+    if n:
+        count += chr(ord("F") + n)
+    return count
+
+
+def _encode_run(match):
+    run = match.group(0)
+    return _repeat_count(len(run)) + run[0]
+
+
+def compress_ascii(data, bytes_per_row):
+    """Applies ZPL's ASCII run-length compression to packed rows.
+
+    Rows equal to the previous one become ":", trailing zeros and ones
+    become "," and "!", and runs of a hex digit are replaced by a repeat
+    count followed by the digit.
+    """
+    hexdata = data.hex().upper()
+    width = 2 * bytes_per_row
+    rows = []
+    previous = None
+    for start in range(0, len(hexdata), width):
+        row = hexdata[start:start + width]
+        if row == previous:
+            rows.append(":")
+            continue
+        previous = row
+        suffix = ""
+        stripped = row.rstrip("0")
+        if len(stripped) < len(row):
+            row, suffix = stripped, ","
+        else:
+            stripped = row.rstrip("F")
+            if len(stripped) < len(row):
+                row, suffix = stripped, "!"
+        rows.append(_RUN.sub(_encode_run, row) + suffix)
+    return "".join(rows)
+
+
+def compress_z64(data):
+    """Returns data in ZPL's Z64 form: deflated, base64 encoded, with CRC."""
+    encoded = base64.b64encode(zlib.compress(data, 9))
+    return ":Z64:%s:%04X" % (encoded.decode("ascii"), binascii.crc_hqx(encoded, 0))
+
+
+def graphic_field(image, threshold=128, compression="z64"):
+    """Encodes an image as a ZPL ^GF graphic field command.
+
+    compression is "z64" (deflate, smallest), "ascii" (run-length
+    compressed hex) or None (plain hex).
+    """
+    data, bytes_per_row = pack_image(image, threshold)
+    if compression == "z64":
+        field = compress_z64(data)
+    elif compression == "ascii":
+        field = compress_ascii(data, bytes_per_row)
+    elif compression is None:
+        field = data.hex().upper()
+    else:
+        raise ValueError("compression must be one of %r" % (COMPRESSIONS,))
+    return "^GFA,%d,%d,%d,%s" % (len(data), len(data), bytes_per_row, field)
+
+
+def image_to_zpl(image, x=0, y=0, threshold=128, compression="z64"):
+    """Returns a complete ZPL label printing image at (x, y) dots."""
+    return "^XA^FO%d,%d%s^FS^XZ" % (x, y, graphic_field(image, threshold, compression))
+
+
+class StoredFormat:
+    """A ZPL label template sent once as a stored format for many labels.
+
+    source is one ^XA...^XZ label whose variable data are {{ name }}
+    placeholders inside ^FD...^FS fields. Each such field becomes an ^FN
+    field of a format stored on the printer with ^DF, so a label only
+    carries an ^XF recall and its field values. Placeholders elsewhere, e.g.
+    in ^FO positions, cannot vary per label and raise ValueError.
+    """
+
+    def __init__(self, source, name="TOPRINT.ZPL", device="R", escape=None):
+        self.name = name
+        self.device = device
+        self.fields = []
+
+        def to_field(match):
+            if not PLACEHOLDER.search(match.group(1)):
+                return match.group(0)
+            self.fields.append(compile_template(match.group(1), escape))
+            return "^FN%d^FS" % len(self.fields)
+
+        self.layout = _FIELD_DATA.sub(to_field, _LABEL_FRAME.sub("", source))
+        if PLACEHOLDER.search(self.layout):
+            raise ValueError("placeholders are only supported inside ^FD fields")
+
+    @property
+    def path(self):
+        return "%s:%s" % (self.device, self.name)
+
+    def define(self):
+        """Returns the ^DF label that stores the format on the printer."""
+        return "^XA^DF%s^FS%s^XZ" % (self.path, self.layout)
+
+    def recall(self, data):
+        """Returns the ^XF label printing the stored format with data."""
+        values = "".join("^FN%d^FD%s^FS" % (number, field.render(data))
+                         for number, field in enumerate(self.fields, 1))
+        return "^XA^XF%s^FS%s^XZ" % (self.path, values)
+
+    def labels(self, records):
+        """Yields the format definition followed by one recall per record."""
+        yield self.define()
+        for data in records:
+            yield self.recall(data)
+
+
+def zpl_batch(source, records, name="TOPRINT.ZPL", device="R", escape=None):
+    """Yields a stored-format ZPL stream printing source once per record."""
+    return StoredFormat(source, name, device, escape).labels(records)
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from toPrint import aiter_toPrint
+
+
+class CheckingTokenizer:
+    """Fails if tokenize() is entered by two threads at once."""
+
+    def __init__(self):
+        self.busy = threading.Lock()
+
+    def tokenize(self, text):
+        if not self.busy.acquire(blocking=False):
+            raise RuntimeError("Already borrowed")
+        try:
+            threading.Event().wait(0.001)
+            return text.split()
+        finally:
+            self.busy.release()
+
+
+class AsyncTokenizer:
+    async def tokenize(self, text):
+        await asyncio.sleep(0)
+        return text.split()
+
+
+async def _collect(texts, tokenizer, **options):
+    return [doc async for doc in aiter_toPrint(texts, tokenizer, **options)]
+
+
+def test_blocking_tokenizer_is_not_called_concurrently():
+    texts = ["%d a b" % i for i in range(50)]
+    docs = asyncio.run(_collect(texts, CheckingTokenizer(), max_len=2, window=8))
+    assert docs == [[str(i), "a"] for i in range(50)]
+
+
+def test_async_source_and_tokenizer():
+    async def source():
+        for i in range(10):
+            yield "x %d" % i
+
+    docs = asyncio.run(_collect(source(), AsyncTokenizer(), window=3))
+    assert docs == [["x", str(i)] for i in range(10)]
@@ -0,0 +1,40 @@
+import os
+
+from toPrint import RenderCache, TokenCache
+from toPrint import cache as cache_module
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(maxsize=2)
+    cache.put("a", ["a"])
+    cache.put("b", ["b"])
+    assert cache.get("a") == ["a"]
+    cache.put("c", ["c"])
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"] and cache.get("c") == ["c"]
+    assert cache.info() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_render_cache_round_trip_and_eviction(tmp_path):
+    cache = RenderCache(str(tmp_path), max_bytes=10)
+    keys = [RenderCache.key("doc %d" % i) for i in range(3)]
+    cache.put(keys[0], b"12345")
+    cache.put(keys[1], b"67890")
+    assert cache.get(keys[0]) == b"12345"
+    cache.put(keys[2], b"abcde")
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == b"12345"
+    assert not [name for _, _, names in os.walk(tmp_path) for name in names
+                if name.startswith(".")]
+    reopened = RenderCache(str(tmp_path), max_bytes=10)
+    assert len(reopened) == 2
+    assert reopened.get_or_render(keys[2], lambda: b"unused") == b"abcde"
+
+
+def test_render_cache_key_covers_backend_versions(monkeypatch):
+    key = RenderCache.key("<p>x</p>", "t", {"dpi": 203})
+    assert key == RenderCache.key("<p>x</p>", "t", {"dpi": 203})
+    assert key != RenderCache.key("<p>x</p>", "t", {"dpi": 300})
+    assert key != RenderCache.key("<p>x</p>", "t", {"dpi": 203}, version="2")
+    monkeypatch.setattr(cache_module, "backend_versions", lambda: "weasyprint=99")
+    assert key != RenderCache.key("<p>x</p>", "t", {"dpi": 203})
@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+
+from toPrint.cli import collect_jobs, main
+from toPrint.convert import run_job
+
+
+def test_run_job_reports_instead_of_raising(tmp_path):
+    assert "error" in run_job({"to": "zpl"})
+    result = run_job({"input": str(tmp_path / "missing.png")})
+    assert result["error"].startswith("FileNotFoundError")
+    (tmp_path / "notes.txt").write_text("hello")
+    result = run_job({"input": str(tmp_path / "notes.txt")})
+    assert "unsupported input" in result["error"]
+
+
+def test_collect_jobs_from_directories_and_manifests(tmp_path):
+    (tmp_path / "in").mkdir()
+    for name in ("b.png", "a.pdf", "skip.txt"):
+        (tmp_path / "in" / name).write_bytes(b"")
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text('{"input": "x.html", "to": "pdf"}\n\n'
+                        '{"input": "y.png", "printer": "label-1"}\n')
+    jobs = collect_jobs([str(tmp_path / "in"), str(manifest)], out_dir="out",
+                        options={"dpi": 300})
+    assert [(os.path.basename(job["input"]), job["to"], job.get("output"))
+            for job in jobs] == [
+        ("a.pdf", "zpl", "out/a.zpl"), ("b.png", "zpl", "out/b.zpl"),
+        ("x.html", "pdf", "out/x.pdf"), ("y.png", "zpl", "out/y.zpl")]
+    assert all(job["dpi"] == 300 for job in jobs)
+    assert collect_jobs([str(manifest)])[1].get("output") is None
+
+
+def test_collect_jobs_skips_files_in_the_target_format(tmp_path):
+    for name in ("a.png", "a.zpl", "b.zpl"):
+        (tmp_path / name).write_bytes(b"")
+    for source in (tmp_path, tmp_path / "*"):
+        assert [job["output"] for job in collect_jobs([str(source)])] == [
+            str(tmp_path / "a.zpl")]
+    assert collect_jobs([str(tmp_path / "b.zpl")]) == []
+    assert len(collect_jobs([str(tmp_path / "b.zpl")], out_dir=str(tmp_path / "out"))) == 1
+
+
+def test_collect_jobs_keeps_subdirectories_under_out_dir(tmp_path):
+    (tmp_path / "in" / "sub").mkdir(parents=True)
+    for name in ("a.png", "sub/a.png"):
+        (tmp_path / "in" / name).write_bytes(b"")
+    out = str(tmp_path / "out")
+    for source in ("in", "in/**/*.png"):
+        jobs = collect_jobs([str(tmp_path / source)], out_dir=out)
+        assert [job["output"] for job in jobs] == [
+            os.path.join(out, "a.zpl"), os.path.join(out, "sub", "a.zpl")]
+
+
+def test_collect_jobs_refuses_duplicate_outputs(tmp_path, capsys):
+    for name in ("a.png", "a.pdf"):
+        (tmp_path / name).write_bytes(b"")
+    with pytest.raises(ValueError, match="both write"):
+        collect_jobs([str(tmp_path)])
+    assert main(["batch", str(tmp_path / "a.png"), str(tmp_path / "a.pdf"), "-j", "1"]) == 2
+    assert "both write" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("line", ['{"to": "zpl"}', "[1]", "{oops",
+                                  '{"input": "a", "to": "doc"}'])
+def test_batch_reports_bad_manifest_lines(tmp_path, capsys, line):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text('{"input": "a.png"}\n' + line + "\n")
+    assert main(["batch", str(manifest), "-j", "1"]) == 2
+    assert "jobs.jsonl:2:" in capsys.readouterr().err
+
+
+def test_batch_converts_images_to_zpl(tmp_path, capsys):
+    Image = pytest.importorskip("PIL.Image")
+    pytest.importorskip("numpy")
+    for name in ("a", "b"):
+        Image.new("L", (40, 20), 0).save(tmp_path / ("%s.png" % name))
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(json.dumps({"input": str(tmp_path / "missing.png")}) + "\n")
+    out = tmp_path / "out"
+    assert main(["batch", str(tmp_path / "*.png"), "--out-dir", str(out), "-j", "1"]) == 0
+    assert sorted(path.name for path in out.iterdir()) == ["a.zpl", "b.zpl"]
+    assert (out / "a.zpl").read_bytes().startswith(b"^XA")
+    assert "2 jobs, 0 failed" in capsys.readouterr().err
+    assert main(["batch", str(manifest), "-j", "1"]) == 1
+    assert "1 jobs, 1 failed" in capsys.readouterr().err
@@ -0,0 +1,34 @@
+import pytest
+
+from toPrint import TokenArray
+
+DOCS = [["a", "b", "a"], [], ["c"], ["b", "c", "d", "a"]]
+
+
+def test_round_trip_and_shared_vocabulary():
+    array = TokenArray.from_docs(DOCS)
+    assert len(array) == 4
+    assert array.to_lists() == DOCS
+    assert array.vocab == ["a", "b", "c", "d"]
+    assert list(array[0]) == [0, 1, 0]
+    assert list(array[-1]) == [1, 2, 3, 0]
+    with pytest.raises(IndexError):
+        array[4]
+
+
+def test_slices_are_token_arrays():
+    array = TokenArray.from_docs(DOCS)
+    part = array[1:3]
+    assert isinstance(part, TokenArray)
+    assert part.to_lists() == DOCS[1:3]
+    assert part.vocab is array.vocab
+    assert array[3:1].to_lists() == []
+    with pytest.raises(ValueError):
+        array[::2]
+
+
+def test_to_numpy():
+    np = pytest.importorskip("numpy")
+    ids, offsets = TokenArray.from_docs(DOCS).to_numpy()
+    assert offsets.tolist() == [0, 3, 3, 4, 8]
+    assert np.array_equal(ids[offsets[3]:offsets[4]], [1, 2, 3, 0])
@@ -0,0 +1,109 @@
+import http.client
+import json
+import os
+import socket
+import stat
+import time
+
+import pytest
+
+from toPrint.daemon import PrintDaemon
+from toPrint.testing import FakePrinter
+
+
+@pytest.fixture
+def printer():
+    with FakePrinter() as fake:
+        yield fake
+
+
+@pytest.fixture
+def daemon(tmp_path, printer):
+    (tmp_path / "label.zpl").write_bytes(b"^XA^FDhi^XZ")
+    server = PrintDaemon(port=0, socket_path=str(tmp_path / "daemon.sock"), workers=2,
+                         max_pending=4, render_workers=0, root=str(tmp_path),
+                         printers=["%s:%d" % (printer.host, printer.port)])
+    with server:
+        yield server
+
+
+def _request(daemon, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(*daemon.address, timeout=5)
+    headers = dict({"Content-Type": "application/json"}, **(headers or {}))
+    connection.request(method, path, None if body is None else json.dumps(body), headers)
+    response = connection.getresponse()
+    reply = json.loads(response.read())
+    connection.close()
+    return response.status, reply
+
+
+def _wait_done(daemon, job_id):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        status = daemon.status(job_id)
+        if status["state"] in ("done", "failed"):
+            return status
+        time.sleep(0.01)
+    raise AssertionError("job %s did not finish" % job_id)
+
+
+def test_http_job_is_printed_and_reported(daemon, printer, tmp_path):
+    job = {"input": "label.zpl", "output": "out/label.zpl",
+           "printer": "%s:%d" % (printer.host, printer.port)}
+    status, reply = _request(daemon, "POST", "/jobs", job)
+    assert status == 202
+    assert _wait_done(daemon, reply["id"])["state"] == "done"
+    assert _request(daemon, "GET", "/jobs/" + reply["id"])[1]["bytes"] == 11
+    assert (tmp_path / "out" / "label.zpl").read_bytes() == b"^XA^FDhi^XZ"
+    deadline = time.monotonic() + 2
+    while printer.received != b"^XA^FDhi^XZ" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert printer.received == b"^XA^FDhi^XZ"
+    assert _request(daemon, "GET", "/stats")[1]["done"] == 1
+
+
+def test_http_refuses_forgeable_requests(daemon):
+    job = {"input": "label.zpl"}
+    assert _request(daemon, "POST", "/jobs", job,
+                    {"Content-Type": "text/plain"})[0] == 415
+    assert _request(daemon, "POST", "/jobs", job, {"Host": "evil.example:8631"})[0] == 403
+    assert _request(daemon, "GET", "/stats", None, {"Host": "evil.example"})[0] == 403
+    assert _request(daemon, "GET", "/stats", None, {"Host": "localhost:1"})[0] == 200
+
+
+@pytest.mark.parametrize("job", [
+    {"input": "/etc/hostname"},
+    {"input": "../label.zpl"},
+    {"input": "label.zpl", "output": "/tmp/elsewhere.zpl"},
+    {"input": "label.zpl", "printer": "203.0.113.5:9100"},
+    {"output": "x.zpl"},
+])
+def test_jobs_outside_root_or_allowed_printers_are_refused(daemon, job):
+    status, reply = _request(daemon, "POST", "/jobs", job)
+    assert status == 400
+    assert daemon.stats()["submitted"] == 0
+
+
+def test_full_queue_refuses_whole_lists(daemon):
+    status, reply = _request(daemon, "POST", "/jobs", [{"input": "label.zpl"}] * 5)
+    assert status == 503
+    assert daemon.stats()["rejected"] == 5
+
+
+def test_unix_socket_protocol(daemon, tmp_path):
+    path = str(tmp_path / "daemon.sock")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.connect(path)
+        stream = sock.makefile("rwb")
+
+        def ask(request):
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+        job_id = ask({"op": "submit", "job": {"input": "missing.png"}})["id"]
+        assert _wait_done(daemon, job_id)["state"] == "failed"
+        assert ask({"op": "status", "id": job_id})["error"].startswith("FileNotFoundError")
+        assert ask({"op": "stats"})["failed"] == 1
+        assert "error" in ask({"op": "nope"})
@@ -0,0 +1,58 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+from toPrint import dither as dithering  # noqa: E402
+
+
+def _reference_floyd_steinberg(pixels, level=128):
+    """The classic pixel-by-pixel scan."""
+    pixels = pixels.astype(np.float32).copy()
+    height, width = pixels.shape
+    ink = np.zeros((height, width), dtype=bool)
+    for y in range(height):
+        for x in range(width):
+            old = pixels[y, x]
+            ink[y, x] = old < level
+            error = old - (0.0 if ink[y, x] else 255.0)
+            if x + 1 < width:
+                pixels[y, x + 1] += error * (7 / 16)
+            if y + 1 < height:
+                if x > 0:
+                    pixels[y + 1, x - 1] += error * (3 / 16)
+                pixels[y + 1, x] += error * (5 / 16)
+                if x + 1 < width:
+                    pixels[y + 1, x + 1] += error * (1 / 16)
+    return ink
+
+
+def _ink(image):
+    return ~np.asarray(image)
+
+
+def test_floyd_steinberg_matches_the_sequential_scan():
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 256, (23, 37)).astype(np.uint8)
+    assert np.array_equal(_ink(dithering.floyd_steinberg(pixels)),
+                          _reference_floyd_steinberg(pixels))
+
+
+def test_methods_keep_the_grey_level():
+    grey = np.full((32, 32), 64, dtype=np.uint8)
+    for method in dithering.METHODS:
+        image = dithering.dither(grey, method)
+        assert image.mode == "1" and image.size == (32, 32)
+        share = _ink(image).mean()
+        if method == "threshold":
+            assert share == 1.0
+        else:
+            assert abs(share - 0.75) < 0.05, method
+
+
+def test_bayer_needs_a_power_of_two_and_methods_are_checked():
+    assert dithering.bayer(np.zeros((4, 4)), size=8).size == (4, 4)
+    with pytest.raises(ValueError):
+        dithering.bayer(np.zeros((4, 4)), size=3)
+    with pytest.raises(ValueError):
+        dithering.dither(np.zeros((4, 4)), "atkinson")
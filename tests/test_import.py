@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import toPrint
+
+# Modules "import toPrint" must not load; see benchmarks/bench_import.py.
+HEAVY = ("weasyprint", "reportlab", "PIL", "numpy", "pypdf", "pypdfium2",
+         "asyncio", "multiprocessing")
+
+
+def _loaded_after(code):
+    src = os.path.dirname(os.path.dirname(toPrint.__file__))
+    env = dict(os.environ, PYTHONPATH=src)
+    output = subprocess.run([sys.executable, "-c", code + "; import sys; "
+                             "print(' '.join(sys.modules))"],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_import_loads_no_heavy_backend():
+    loaded = _loaded_after("import toPrint")
+    assert sorted(name for name in HEAVY if name in loaded) == []
+
+
+def test_public_names_resolve_lazily():
+    loaded = _loaded_after("import toPrint; toPrint.TokenCache")
+    assert "toPrint.cache" in loaded
+    assert "toPrint.renderer" not in loaded
+    assert set(toPrint.__all__) <= set(dir(toPrint))
+    for name in toPrint.__all__:
+        assert getattr(toPrint, name) is not None
@@ -0,0 +1,31 @@
+import io
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+Image = pytest.importorskip("PIL.Image")
+
+from toPrint import merge_pdfs  # noqa: E402
+
+
+def _pdf(pages):
+    images = [Image.new("L", (100, 50), 40 * page) for page in range(pages)]
+    output = io.BytesIO()
+    images[0].save(output, "PDF", save_all=True, append_images=images[1:])
+    return output.getvalue()
+
+
+def test_merges_paths_bytes_and_files(tmp_path):
+    path = tmp_path / "first.pdf"
+    path.write_bytes(_pdf(2))
+    output = tmp_path / "merged.pdf"
+    sources = [str(path), _pdf(1), io.BytesIO(_pdf(3))]
+    assert merge_pdfs(sources, str(output)) == 6
+    assert len(pypdf.PdfReader(str(output)).pages) == 6
+
+
+def test_identical_objects_are_stored_once(tmp_path):
+    one = _pdf(1)
+    merged = io.BytesIO()
+    assert merge_pdfs([one] * 20, merged) == 20
+    assert len(merged.getvalue()) < 5 * len(one)
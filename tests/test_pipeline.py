@@ -0,0 +1,37 @@
+import pytest
+
+from toPrint import Pipeline
+
+
+def test_views_are_passed_without_copies():
+    pipeline = Pipeline()
+    pipeline.add("body", lambda data: data[4:-4])
+    pipeline.add("upper", lambda data: bytes(data).upper(), after="body")
+    pipeline.add("size", lambda data: b"%d" % len(data), after="body", accepts="bytes")
+    outputs = pipeline.run(b"HEAD^xa^fdhi^xzTAIL")
+    assert {name: bytes(view) for name, view in outputs.items()} == {
+        "upper": b"^XA^FDHI^XZ", "size": b"11"}
+    assert pipeline.stats["body"]["copied"] == pipeline.stats["body"]["allocated"] == 0
+    assert pipeline.stats["size"]["copied"] == 11
+    assert pipeline.total_copied() == 11 + 11 + 2
+
+
+def test_file_stages_count_what_they_read():
+    pipeline = Pipeline().add("first", lambda fh: fh.read(3), accepts="file")
+    assert bytes(pipeline.run(b"abcdef")["first"]) == b"abc"
+    assert pipeline.stats["first"]["copied"] == 3
+
+
+def test_fan_in_and_graph_checks():
+    pipeline = Pipeline()
+    pipeline.add("a", lambda data: data[:1])
+    pipeline.add("b", lambda data: data[1:])
+    pipeline.add("joined", lambda a, b: bytes(b) + bytes(a), after=["a", "b"])
+    assert pipeline.sinks() == ["joined"]
+    assert bytes(pipeline.run(b"xyz")["joined"]) == b"yzx"
+    with pytest.raises(ValueError):
+        pipeline.add("a", lambda data: data)
+    with pytest.raises(ValueError):
+        pipeline.add("c", lambda data: data, after="missing")
+    with pytest.raises(ValueError):
+        pipeline.add("d", lambda data: data, accepts="str")
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from toPrint.printer import ConnectionPool
+from toPrint.testing import FakePrinter
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def printer():
+    with FakePrinter() as fake:
+        yield fake
+
+
+def test_jobs_share_one_connection(printer):
+    with ConnectionPool(printer.host, printer.port) as pool:
+        futures = [pool.submit("^XA^FD%d^XZ" % i) for i in range(20)]
+        assert [future.result(timeout=2) for future in futures] == [
+            len("^XA^FD%d^XZ" % i) for i in range(20)]
+    _wait_for(lambda: len(printer.received) == sum(len("^XA^FD%d^XZ" % i)
+                                                   for i in range(20)))
+    assert printer.received == "".join("^XA^FD%d^XZ" % i for i in range(20)).encode()
+    assert printer.connections == 1
+    assert pool.connects == 1
+
+
+def test_reconnects_after_the_printer_drops_the_connection(printer):
+    with ConnectionPool(printer.host, printer.port, backoff=0.01) as pool:
+        pool.send(b"A")
+        _wait_for(lambda: printer.received == b"A")
+        printer.drop_connections()
+        _wait_for(lambda: not printer._sockets)
+        pool.send(b"B")
+        _wait_for(lambda: printer.received == b"AB")
+    assert pool.connects == 2
+
+
+def test_send_fails_when_the_printer_is_gone():
+    with FakePrinter() as fake:
+        host, port = fake.host, fake.port
+    with ConnectionPool(host, port, retries=1, backoff=0.01) as pool:
+        with pytest.raises(OSError):
+            pool.send(b"lost")
+
+
+def test_cancelled_jobs_are_skipped(printer):
+    release = threading.Event()
+    with ConnectionPool(printer.host, printer.port) as pool:
+        # Keep the sender busy so the next jobs wait in the queue.
+        write = pool._write
+        pool._write = lambda sock, payload: (release.wait(2), write(sock, payload))[1]
+        first = pool.submit(b"0")
+        queued = [pool.submit(str(i)) for i in range(1, 5)]
+        assert queued[1].cancel()
+        release.set()
+        assert first.result(timeout=2) == 1
+        for future in (queued[0], queued[2], queued[3]):
+            assert future.result(timeout=2) == 1
+        assert pool.submit(b"C").result(timeout=2) == 1
+    _wait_for(lambda: printer.received == b"0134C")
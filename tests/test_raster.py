@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pypdfium2")
+Image = pytest.importorskip("PIL.Image")
+
+from toPrint.raster import iter_pages, iter_raster, iter_zpl, print_pdf  # noqa: E402
+
+
+def _pdf(pages=3):
+    """A PDF of 2x1 inch pages, each with a black box of growing width."""
+    images = []
+    for page in range(pages):
+        image = Image.new("L", (200, 100), 255)
+        image.paste(0, (10, 10, 40 + 40 * page, 90))
+        images.append(image)
+    output = io.BytesIO()
+    images[0].save(output, "PDF", resolution=100, save_all=True, append_images=images[1:])
+    return output.getvalue()
+
+
+def test_pages_render_at_dpi_or_width():
+    pdf = _pdf()
+    assert [page.size for page in iter_pages(pdf, dpi=203)] == [(406, 203)] * 3
+    assert next(iter_pages(pdf, width=812)).size == (812, 406)
+
+
+@pytest.mark.parametrize("dither", [None, "threshold", "floyd-steinberg"])
+def test_raster_pages_are_one_bit(dither):
+    pages = list(iter_raster(_pdf(), dpi=100, dither=dither))
+    assert [page.mode for page in pages] == ["1"] * 3
+    inks = [page.histogram()[0] for page in pages]
+    assert inks[0] < inks[1] < inks[2]
+
+
+def test_print_pdf_sends_one_label_per_page():
+    labels = []
+    assert print_pdf(_pdf(), labels.append, dpi=100) == 3
+    assert labels == list(iter_zpl(_pdf(), dpi=100))
+    assert all(label.startswith("^XA^FO0,0^GFA,") for label in labels)
@@ -0,0 +1,66 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from toPrint.renderer import RendererPool
+
+
+@pytest.fixture
+def weasyprint(monkeypatch):
+    """A minimal weasyprint recording fonts and stylesheets per render."""
+    module = types.ModuleType("weasyprint")
+    fonts = types.ModuleType("weasyprint.text.fonts")
+    active = threading.Lock()
+
+    class FontConfiguration:
+        pass
+
+    class CSS:
+        def __init__(self, string, font_config):
+            self.string = string
+            self.font_config = font_config
+
+    class HTML:
+        def __init__(self, string, base_url=None):
+            self.string = string
+
+        def write_pdf(self, stylesheets, font_config):
+            if not active.acquire(blocking=False):
+                raise RuntimeError("concurrent render")
+            try:
+                threading.Event().wait(0.001)
+                assert all(sheet.font_config is font_config for sheet in stylesheets)
+                return ("%s|%s" % (self.string, ",".join(sheet.string for sheet in
+                                                         stylesheets))).encode()
+            finally:
+                active.release()
+
+    fonts.FontConfiguration = FontConfiguration
+    module.CSS, module.HTML = CSS, HTML
+    monkeypatch.setitem(sys.modules, "weasyprint", module)
+    monkeypatch.setitem(sys.modules, "weasyprint.text", types.ModuleType("weasyprint.text"))
+    monkeypatch.setitem(sys.modules, "weasyprint.text.fonts", fonts)
+    return module
+
+
+def test_inline_pools_keep_their_own_stylesheets(weasyprint):
+    first = RendererPool(workers=0, stylesheets=["a"])
+    second = RendererPool(workers=0, stylesheets=["b"])
+    assert first.render("x") == b"x|a"
+    assert second.render("x", stylesheets=["c"]) == b"x|b,c"
+    assert first.render("y", stylesheets=["c"]) == b"y|a,c"
+    assert first.stats()["count"] == 2
+
+
+def test_inline_renders_from_threads_take_turns(weasyprint):
+    pool = RendererPool(workers=0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.render("t")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [b"t|"] * 8
@@ -0,0 +1,108 @@
+import queue
+import threading
+
+import pytest
+
+from toPrint import Spooler
+from toPrint.printer import ConnectionPool
+from toPrint.testing import FakePrinter
+
+
+def test_jobs_are_rendered_and_sent_to_their_printer():
+    sent = {"a": [], "b": []}
+    with Spooler(render_workers=1) as spooler:
+        spooler.add_printer("a", sent["a"].append)
+        spooler.add_printer("b", sent["b"].append)
+        futures = [spooler.submit("a", "^XA%d^XZ" % i) for i in range(3)]
+        futures.append(spooler.submit("b", {"n": 7}, render=lambda job: b"job %d" % job["n"]))
+        assert [future.result(timeout=2) for future in futures] == [7, 7, 7, 5]
+    assert sent == {"a": [b"^XA0^XZ", b"^XA1^XZ", b"^XA2^XZ"], "b": [b"job 7"]}
+
+
+def test_higher_priorities_render_first():
+    release = threading.Event()
+    order = []
+
+    def render(job):
+        release.wait(2)
+        order.append(job)
+        return job
+
+    with Spooler(render_workers=1) as spooler:
+        spooler.add_printer("p", lambda data: None)
+        first = spooler.submit("p", "first", render)
+        # The renderer is busy with "first"; the rest wait in the queue.
+        while spooler._printers["p"].pending.qsize():
+            threading.Event().wait(0.001)
+        futures = [spooler.submit("p", name, render, priority)
+                   for name, priority in (("low", 0), ("high", 5), ("low2", 0))]
+        release.set()
+        for future in [first] + futures:
+            future.result(timeout=2)
+    assert order == ["first", "high", "low", "low2"]
+
+
+def test_parallel_renders_are_sent_in_order():
+    sent = []
+    slow = threading.Event()
+
+    def render(job):
+        if job == "slow":
+            slow.wait(0.2)
+        return job
+
+    with Spooler(render_workers=2) as spooler:
+        spooler.add_printer("p", sent.append)
+        futures = [spooler.submit("p", job, render) for job in ("slow", "fast", "last")]
+        for future in futures:
+            future.result(timeout=2)
+    assert sent == [b"slow", b"fast", b"last"]
+
+
+def test_errors_fail_only_their_job():
+    def send(data):
+        if data == b"bad":
+            raise OSError("paper out")
+
+    with Spooler() as spooler:
+        spooler.add_printer("p", send)
+        bad = spooler.submit("p", "bad")
+        broken = spooler.submit("p", "x", render=lambda job: 1 / 0)
+        good = spooler.submit("p", "good")
+        with pytest.raises(OSError):
+            bad.result(timeout=2)
+        with pytest.raises(ZeroDivisionError):
+            broken.result(timeout=2)
+        assert good.result(timeout=2) == 4
+
+
+def test_full_queue_times_out_and_unknown_printers_are_refused():
+    block = threading.Event()
+    with Spooler(render_workers=1, queue_size=1) as spooler:
+        spooler.add_printer("p", lambda data: None)
+        with pytest.raises(ValueError):
+            spooler.add_printer("p", lambda data: None)
+        with pytest.raises(ValueError):
+            spooler.submit("q", "x")
+        spooler.submit("p", "x", render=lambda job: block.wait(2) and b"x")
+        while spooler._printers["p"].pending.qsize():
+            threading.Event().wait(0.001)
+        spooler.submit("p", "y")
+        with pytest.raises(queue.Full):
+            spooler.submit("p", "z", timeout=0.05)
+        block.set()
+
+
+def test_sends_through_a_connection_pool():
+    with FakePrinter() as printer:
+        with ConnectionPool(printer.host, printer.port) as pool, Spooler() as spooler:
+            spooler.add_printer("zebra", pool)
+            futures = [spooler.submit("zebra", "^XA%d^XZ" % i) for i in range(10)]
+            for future in futures:
+                future.result(timeout=2)
+        tick = threading.Event()
+        for _ in range(200):
+            if len(printer.received) == sum(len("^XA%d^XZ" % i) for i in range(10)):
+                break
+            tick.wait(0.01)
+        assert printer.received == b"".join(b"^XA%d^XZ" % i for i in range(10))
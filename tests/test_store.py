@@ -0,0 +1,47 @@
+import pytest
+
+from toPrint import TokenStore, iter_toPrint, write_store
+
+
+class WordTokenizer:
+    def tokenize(self, text):
+        return text.split()
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "corpus.tpts")
+    texts = ["a b a", "", "c " * 70000, "b"]
+    assert write_store(path, iter_toPrint(texts, WordTokenizer(), 70000)) == 4
+    with TokenStore(path) as store:
+        assert len(store) == 4
+        assert store.tokens(0) == ["a", "b", "a"]
+        assert store.tokens(1) == []
+        assert len(store[2]) == 70000
+        assert store.tokens(-1) == ["b"]
+        with pytest.raises(IndexError):
+            store[4]
+
+
+def test_int_tokens_round_trip_and_others_are_refused_early(tmp_path):
+    path = str(tmp_path / "ids.tpts")
+    assert write_store(path, [[5, 7, 5], ["5"]]) == 2
+    with TokenStore(path) as store:
+        assert store.tokens(0) == [5, 7, 5]
+        assert store.tokens(1) == ["5"]
+
+    def docs():
+        yield [b"bytes"]
+        raise AssertionError("read past the bad token")
+
+    for bad in ([b"bytes"], [("a", "b")], [True]):
+        with pytest.raises(ValueError, match="must be str or int"):
+            write_store(path, [bad])
+    with pytest.raises(ValueError):
+        write_store(path, docs())
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        TokenStore(str(path))
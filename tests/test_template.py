@@ -0,0 +1,25 @@
+import html
+
+from toPrint import Template, compile_template
+
+
+def test_render_and_render_many():
+    template = Template("<p>{{ name }} {x} {{qty}}</p>")
+    assert template.fields == ["name", "qty"]
+    assert template.render({"name": "Ann", "qty": 2}) == "<p>Ann {x} 2</p>"
+    records = [{"name": "A", "qty": 1}, {"name": "B", "qty": 2}]
+    assert list(template.render_many(records)) == ["<p>A {x} 1</p>", "<p>B {x} 2</p>"]
+
+
+def test_escape_applies_to_every_value():
+    template = Template("<b>{{ v }}</b>", escape=html.escape)
+    assert list(template.render_many([{"v": "<i>"}])) == ["<b>&lt;i&gt;</b>"]
+
+
+def test_single_field_and_no_field_templates():
+    assert list(Template("{{a}}").render_many([{"a": 1}, {"a": 2}])) == ["1", "2"]
+    assert Template("static").render({}) == "static"
+
+
+def test_compile_template_reuses_templates():
+    assert compile_template("{{ a }}") is compile_template("{{ a }}")
@@ -0,0 +1,106 @@
+import pytest
+
+from toPrint import TokenCache, iter_toPrint, iter_windows, toPrint
+
+
+class WordTokenizer:
+    """Splits on whitespace and counts the texts it is given."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def tokenize(self, text):
+        self.calls += 1
+        return text.split()
+
+
+class BatchTokenizer(WordTokenizer):
+    def batch_tokenize(self, texts):
+        return [self.tokenize(text) for text in texts]
+
+
+class Encoding:
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+
+class EncodingTokenizer(WordTokenizer):
+    def encode_batch(self, texts):
+        return [Encoding(self.tokenize(text)) for text in texts]
+
+
+class IdTokenizer(WordTokenizer):
+    def batch_encode(self, texts):
+        return [[len(token) for token in self.tokenize(text)] for text in texts]
+
+
+TEXTS = ["one two three", "", "alpha beta " * 300, "single"]
+
+
+def test_truncates_to_max_len():
+    assert toPrint(TEXTS, WordTokenizer(), max_len=2) == [
+        ["one", "two"], [], ["alpha", "beta"], ["single"]]
+
+
+def test_max_len_none_keeps_every_token():
+    assert len(toPrint(TEXTS, WordTokenizer(), max_len=None)[2]) == 600
+
+
+@pytest.mark.parametrize("max_len", [1, 5, 64, None])
+def test_early_stop_matches_full_tokenization(max_len):
+    expected = toPrint(TEXTS, WordTokenizer(), max_len)
+    assert toPrint(TEXTS, WordTokenizer(), max_len, early_stop=True) == expected
+
+
+def test_batch_api_matches_per_text_calls():
+    expected = toPrint(TEXTS, WordTokenizer(), 8)
+    assert toPrint(TEXTS, BatchTokenizer(), 8, batch_size=3) == expected
+
+
+def test_encode_batch_is_used_only_for_tokens():
+    expected = toPrint(TEXTS, WordTokenizer(), 8)
+    assert toPrint(TEXTS, EncodingTokenizer(), 8, batch_size=3) == expected
+    assert toPrint(["ab cde"], IdTokenizer(), 5, batch_size=4) == [["ab", "cde"]]
+    assert toPrint(TEXTS, IdTokenizer(), 8, batch_size=3) == expected
+
+
+def test_iter_toPrint_accepts_a_generator():
+    docs = iter_toPrint((text for text in TEXTS), WordTokenizer(), 3)
+    assert next(docs) == ["one", "two", "three"]
+    assert len(list(docs)) == 3
+
+
+def test_workers_keep_input_order():
+    texts = ["%d x" % i for i in range(100)]
+    docs = toPrint(texts, WordTokenizer(), 4, workers=2, chunk_size=7)
+    assert docs == [[str(i), "x"] for i in range(100)]
+
+
+def test_cache_serves_repeated_texts():
+    cache = TokenCache()
+    tokenizer = WordTokenizer()
+    texts = ["a b", "c d", "a b", "a b"]
+    assert toPrint(texts, tokenizer, 8, cache=cache) == [t.split() for t in texts]
+    assert tokenizer.calls == 2
+    assert toPrint(texts, tokenizer, 8, cache=cache) == [t.split() for t in texts]
+    assert tokenizer.calls == 2
+
+
+def test_array_output():
+    array = toPrint(TEXTS, WordTokenizer(), 2, output="array")
+    assert array.to_lists() == toPrint(TEXTS, WordTokenizer(), 2)
+
+
+def test_windows_cover_every_token():
+    windows = list(iter_windows(["a b c d e", ""], WordTokenizer(), max_len=2, stride=1))
+    assert [(w.doc, w.start, w.tokens) for w in windows] == [
+        (0, 0, ["a", "b"]), (0, 1, ["b", "c"]), (0, 2, ["c", "d"]),
+        (0, 3, ["d", "e"]), (1, 0, [])]
+    with pytest.raises(ValueError):
+        next(iter_windows(["a"], WordTokenizer(), max_len=2, stride=3))
+
+
+@pytest.mark.parametrize("max_len", [None, 0, 2.5])
+def test_windows_need_a_positive_int_max_len(max_len):
+    with pytest.raises(ValueError, match="max_len must be a positive int"):
+        next(iter_windows(["a"], WordTokenizer(), max_len=max_len))
@@ -0,0 +1,59 @@
+import errno
+
+import pytest
+
+from toPrint import MemoryFS
+
+
+def test_files_and_directories_behave_like_os():
+    fs = MemoryFS()
+    fs.makedirs("/jobs/today")
+    with fs.open("jobs/today/a.zpl", "w") as fh:
+        fh.write("^XA^XZ")
+    with fs.open("/jobs/today/a.zpl", "a") as fh:
+        fh.write("\n")
+    assert fs.read("/jobs/today/a.zpl") == b"^XA^XZ\n"
+    assert fs.open("/jobs/today/a.zpl").read() == "^XA^XZ\n"
+    assert fs.listdir("/jobs") == ["today"]
+    assert fs.isdir("/jobs") and fs.isfile("/jobs/today/a.zpl")
+    assert fs.stat("/jobs/today/a.zpl").st_size == 7
+    fs.rename("/jobs/today/a.zpl", "/jobs/a.zpl")
+    assert fs.listdir("/jobs") == ["a.zpl", "today"]
+    fs.rmdir("/jobs/today")
+    fs.remove("/jobs/a.zpl")
+    assert fs.listdir("/jobs") == [] and fs.used == 0
+
+
+@pytest.mark.parametrize("call, error", [
+    (lambda fs: fs.read("/missing"), FileNotFoundError),
+    (lambda fs: fs.read("/dir"), IsADirectoryError),
+    (lambda fs: fs.write("/nowhere/file", b""), FileNotFoundError),
+    (lambda fs: fs.write("/file/child", b""), NotADirectoryError),
+    (lambda fs: fs.mkdir("/dir"), FileExistsError),
+    (lambda fs: fs.open("/file", "x"), FileExistsError),
+    (lambda fs: fs.listdir("/file"), NotADirectoryError),
+])
+def test_errors_match_os(call, error):
+    fs = MemoryFS()
+    fs.mkdir("/dir")
+    fs.write("/file", b"x")
+    with pytest.raises(error):
+        call(fs)
+
+
+def test_quota_evicts_least_recently_used_files():
+    fs = MemoryFS(quota=10)
+    fs.write("/a", b"12345")
+    fs.write("/b", b"12345")
+    fs.read("/a")
+    fs.write("/c", b"123")
+    assert not fs.exists("/b") and fs.exists("/a") and fs.used == 8
+
+
+def test_quota_without_eviction_raises_enospc():
+    fs = MemoryFS(quota=4, evict=False)
+    fs.write("/a", b"1234")
+    with pytest.raises(OSError) as raised:
+        fs.write("/b", b"5")
+    assert raised.value.errno == errno.ENOSPC
+    assert fs.write("/a", b"abcd") == 4
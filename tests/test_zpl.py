@@ -0,0 +1,108 @@
+import base64
+import binascii
+import re
+import zlib
+
+import pytest
+
+from toPrint.zpl import (StoredFormat, compress_ascii, graphic_field, image_to_zpl,
+                         pack_image, zpl_batch)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+needs_numpy = pytest.mark.skipif(np is None, reason="NumPy is not installed")
+
+
+def _count(letters):
+    return sum(ord(c) - ord("F") if c <= "Y" else 20 * (ord(c) - ord("f"))
+               for c in letters)
+
+
+def _decode_ascii(field, bytes_per_row):
+    """Expands ZPL ASCII compression back into packed bytes."""
+    width = 2 * bytes_per_row
+    rows = []
+    for row in re.findall(r"[^:,!]*[,!]|:|[^:,!]+", field):
+        if row == ":":
+            rows.append(rows[-1])
+            continue
+        fill = {",": "0", "!": "F"}.get(row[-1], "")
+        row = re.sub(r"([G-Yg-z]+)([0-9A-F])",
+                     lambda m: m.group(2) * _count(m.group(1)), row.rstrip(",!"))
+        rows.append(row.ljust(width, fill or "0"))
+    return bytes.fromhex("".join(rows))
+
+
+def _decode(command):
+    total, _, bytes_per_row, field = re.match(
+        r"\^GFA,(\d+),(\d+),(\d+),(.*)", command).groups()
+    total, bytes_per_row = int(total), int(bytes_per_row)
+    if field.startswith(":Z64:"):
+        encoded, crc = field[5:].split(":")
+        assert int(crc, 16) == binascii.crc_hqx(encoded.encode(), 0)
+        data = zlib.decompress(base64.b64decode(encoded))
+    elif re.fullmatch(r"[0-9A-F]*", field) and len(field) == 2 * total:
+        data = bytes.fromhex(field)
+    else:
+        data = _decode_ascii(field, bytes_per_row)
+    assert len(data) == total
+    return data, bytes_per_row
+
+
+def _sample():
+    rng = np.random.default_rng(0)
+    ink = np.zeros((40, 83), dtype=bool)
+    ink[5:15, 10:70] = True
+    ink[20:22] = True
+    ink[30:] = rng.random((10, 83)) < 0.5
+    return ink
+
+
+@needs_numpy
+def test_pack_image_rows_are_msb_first():
+    data, bytes_per_row = pack_image(np.array([[True] + [False] * 8]))
+    assert (data, bytes_per_row) == (b"\x80\x00", 2)
+    grey = np.array([[0, 255, 100, 200]], dtype=np.uint8)
+    assert pack_image(grey)[0] == b"\xa0"
+
+
+@needs_numpy
+@pytest.mark.parametrize("compression", ["z64", "ascii", None])
+def test_graphic_field_round_trips(compression):
+    ink = _sample()
+    expected = pack_image(ink)
+    assert _decode(graphic_field(ink, compression=compression)) == expected
+
+
+def test_ascii_compression_uses_repeat_counts():
+    assert compress_ascii(b"\x00" * 4 + b"\xff" * 4 + b"\x12\x34\x56\x78" * 2, 4) == \
+        ",!12345678:"
+    assert compress_ascii(b"\xaa" * 250 + b"\x01", 251) == "zkA01"
+
+
+@needs_numpy
+def test_image_to_zpl_frames_a_label():
+    label = image_to_zpl(_sample(), x=10, y=20)
+    assert label.startswith("^XA^FO10,20^GFA,") and label.endswith("^FS^XZ")
+    with pytest.raises(ValueError):
+        graphic_field(_sample(), compression="lzw")
+
+
+LABEL = "^XA^FO50,50^A0N,30^FD{{ name }}^FS^FO50,90^FDQty: {{ qty }}^FS^FO50,130^FDfixed^FS^XZ"
+
+
+def test_stored_format_sends_only_field_values():
+    labels = list(zpl_batch(LABEL, [{"name": "Ann", "qty": 2}, {"name": "Bo", "qty": 5}],
+                            name="ITEM.ZPL"))
+    assert labels[0] == ("^XA^DFR:ITEM.ZPL^FS^FO50,50^A0N,30^FN1^FS"
+                         "^FO50,90^FN2^FS^FO50,130^FDfixed^FS^XZ")
+    assert labels[1:] == ["^XA^XFR:ITEM.ZPL^FS^FN1^FDAnn^FS^FN2^FDQty: 2^FS^XZ",
+                          "^XA^XFR:ITEM.ZPL^FS^FN1^FDBo^FS^FN2^FDQty: 5^FS^XZ"]
+
+
+def test_stored_format_needs_placeholders_inside_fields():
+    with pytest.raises(ValueError):
+        StoredFormat("^XA^FO{{ x }},50^FDa^FS^XZ")